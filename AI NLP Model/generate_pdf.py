@@ -12,7 +12,6 @@ def create_sample_pdf(filepath):
     c.drawString(72, height - 72, "POLICY: IT Asset Management Policy 2024")
     
     # Body
-    c.setFont("Helvetica", 12)
     text_lines = [
         "1. All employees must return company-issued laptops to the IT Department",
         "   within 3 days of resignation or termination.",
@@ -24,11 +23,14 @@ def create_sample_pdf(filepath):
         "   Employees may be liable for repairs if negligence is proven."
     ]
     
-    y = height - 100
-    for line in text_lines:
-        c.drawString(72, y, line)
-        y -= 15
-        
+    # One text object emits all lines in a single BT...ET block instead of
+    # a per-line drawString (smaller PDF, one font resolution)
+    tobj = c.beginText(72, height - 100)
+    tobj.setFont("Helvetica", 12)
+    tobj.setLeading(15)
+    tobj.textLines("\n".join(text_lines))
+    c.drawText(tobj)
+
     c.save()
     print("✅ PDF generated successfully.")
 
@@ -1,35 +1,81 @@
 import sys
 import os
+import copy
 import json
+import hashlib
+import logging
+import fitz  # PyMuPDF
 import pdfplumber
 import io
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Body
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Body, Depends
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
-import requests
-import traceback
+import httpx
+import orjson
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from src.policy_parser import PolicyParser
 from src.ambiguity_detector import AmbiguityDetector
 from src.utils import clean_text
+from src.cache_manager import CacheManager
+from src.log_setup import configure_queue_logging
 
-app = FastAPI()
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+# -----------------------------------------------------------------------------
+# LOGGING
+# -----------------------------------------------------------------------------
+# Request-path logging goes through a queue so console I/O happens on a
+# background thread instead of blocking the event loop under load.
+# Shared setup with the CLI entry points (src/log_setup.py).
+configure_queue_logging()
+logger = logging.getLogger("policy_nlp")
+
+# Shared async HTTP client for calls to the Execution Backend.
+# Created on startup / closed on shutdown so connections are pooled
+# across requests instead of being re-established per submission.
+_httpx_client: Optional[httpx.AsyncClient] = None
+
+# Shared pipeline components. PolicyParser() performs an Ollama
+# handshake, so both are built once at startup instead of per request.
+PARSER: Optional[PolicyParser] = None
+DETECTOR: Optional[AmbiguityDetector] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _httpx_client, _redis, PARSER, DETECTOR
+    _httpx_client = httpx.AsyncClient(timeout=10.0)
+    if aioredis is not None and os.getenv("REDIS_URL"):
+        _redis = aioredis.from_url(os.getenv("REDIS_URL"))
+    # Parser init pings Ollama - keep it off the event loop
+    PARSER = await run_in_threadpool(PolicyParser)
+    DETECTOR = AmbiguityDetector()
+    yield
+    await _httpx_client.aclose()
+
+# orjson serializes responses several times faster than stdlib json,
+# which matters for large rule lists returned by /api/policy/process
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request, exc):
-    print(f"❌ Validation Error: {exc}")
-    return JSONResponse(
+    logger.warning(f"❌ Validation Error: {exc}")
+    return ORJSONResponse(
         status_code=422,
         content={"detail": str(exc), "body": exc.body},
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
-    print(f"❌ Unhandled Server Error: {exc}")
-    traceback.print_exc()
-    return JSONResponse(
+    logger.exception(f"❌ Unhandled Server Error: {exc}")
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal Server Error", "error": str(exc)},
     )
@@ -43,10 +89,147 @@ app.add_middleware(
 )
 
 # -----------------------------------------------------------------------------
-# IN-MEMORY STORAGE (For Demo/Hackathon purposes)
+# POLICY STORAGE
 # -----------------------------------------------------------------------------
 # Structure: { "POLICY_ID": { "policy_title": "...", "rules": [rule_dict, ...] } }
+# When REDIS_URL is set (and redis is installed) policies live in Redis so
+# /clarify and /submit work from any worker; otherwise we keep the original
+# per-process dict, which is fine for the single-worker demo setup.
 POLICY_STORE = {}
+_redis = None
+POLICY_TTL_SECONDS = 86400  # Avoid unbounded growth in Redis
+
+async def _store_set(policy_id: str, data: Dict[str, Any]):
+    """Persist a processed policy."""
+    if _redis is not None:
+        await _redis.set(f"policy:{policy_id}", orjson.dumps(data), ex=POLICY_TTL_SECONDS)
+    else:
+        POLICY_STORE[policy_id] = data
+
+async def _store_get(policy_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch a processed policy, or None if unknown/expired."""
+    if _redis is not None:
+        raw = await _redis.get(f"policy:{policy_id}")
+        return orjson.loads(raw) if raw else None
+    return POLICY_STORE.get(policy_id)
+
+# -----------------------------------------------------------------------------
+# PDF EXTRACTION WORKERS
+# -----------------------------------------------------------------------------
+# Pages are independent, so multi-page PDFs are extracted in parallel.
+# PyMuPDF releases the GIL inside get_text, so threads scale here and a
+# module-level pool amortizes worker startup across requests.
+_PAGE_POOL = ThreadPoolExecutor(max_workers=min(os.cpu_count() or 2, 4))
+_PARALLEL_PAGE_THRESHOLD = 4
+
+# Plain-text flags only: skip image/clip handling and keep whitespace.
+# (TEXT_INHIBIT_SPACES is deliberately NOT set - it drops the generated
+# spaces narrative text depends on.)
+_TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE
+
+# Corrupt pages otherwise emit per-page MuPDF warnings to stderr
+fitz.TOOLS.mupdf_display_errors(False)
+
+# Stop collecting text beyond this point - the parser chunks its input
+# anyway, so extracting hundreds more pages only burns wall time
+MAX_EXTRACT_CHARS = 200_000
+
+# Pipeline results keyed by sha256 of the uploaded bytes. Re-uploads of
+# the same PDF (near-certain during demos) skip extraction and Ollama
+# entirely; exact byte keying avoids any paraphrase-drift issues.
+_RESULT_CACHE = CacheManager(cache_dir="demo_data/process_cache")
+
+def _extract_page(pdf_bytes: bytes, page_num: int) -> tuple:
+    """Worker: re-open the document from bytes and extract a single page."""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return page_num, doc[page_num].get_text("text", flags=_TEXT_FLAGS)
+
+def _extract_pdf_text(pdf_bytes: bytes) -> str:
+    """
+    Extract text from PDF bytes (blocking).
+    Runs in a worker thread via run_in_threadpool so the event loop stays free.
+    """
+    logger.info("📄 Starting text extraction with PyMuPDF...")
+    extracted_text = ""
+
+    try:
+        # fitz accepts the raw bytes directly - no BytesIO copy needed
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        total_pages = doc.page_count
+        logger.info("📖 PDF has %d pages", total_pages)
+
+        # Probe the first pages: an image-only PDF yields no text, and
+        # walking all its pages before the fallback is wasted work
+        probe = min(3, total_pages)
+        page_texts = [t for t in (doc[i].get_text("text", flags=_TEXT_FLAGS) for i in range(probe)) if t]
+        chars = sum(len(t) for t in page_texts)
+
+        if not page_texts and total_pages > probe:
+            logger.warning("  ⚠ First pages empty - aborting to fallback early")
+            doc.close()
+        elif total_pages > _PARALLEL_PAGE_THRESHOLD:
+            # Dispatch one task per remaining page; collect, sort, join
+            doc.close()
+            logger.info("⚡ Extracting %d remaining pages in parallel...", total_pages - probe)
+            futures = [
+                _PAGE_POOL.submit(_extract_page, pdf_bytes, i)
+                for i in range(probe, total_pages)
+            ]
+            results = sorted(f.result() for f in futures)
+            for _, text in results:
+                if not text:
+                    continue
+                page_texts.append(text)
+                chars += len(text)
+                if chars >= MAX_EXTRACT_CHARS:
+                    logger.info("  ✂ Stopping at %s chars (cap %s)", f"{chars:,}", f"{MAX_EXTRACT_CHARS:,}")
+                    break
+        else:
+            for i in range(probe, total_pages):
+                text = doc[i].get_text("text", flags=_TEXT_FLAGS)
+                if text:
+                    page_texts.append(text)
+                    chars += len(text)
+                    logger.info("  ✓ Page %d/%d: %d chars", i + 1, total_pages, len(text))
+                    if chars >= MAX_EXTRACT_CHARS:
+                        logger.info("  ✂ Stopping at %s chars (cap %s)", f"{chars:,}", f"{MAX_EXTRACT_CHARS:,}")
+                        break
+                else:
+                    logger.warning("  ⚠ Page %d/%d: No text extracted", i + 1, total_pages)
+            doc.close()
+
+        extracted_text = "\n".join(page_texts)
+
+    except Exception as e:
+        logger.warning("⚠️ PyMuPDF failed: %s: %s", type(e).__name__, e)
+        extracted_text = ""
+
+    # Fallback to pdfplumber if almost no text (likely scanned/image PDF)
+    if len(extracted_text.strip()) < 50:
+        logger.warning("⚠️ PyMuPDF yielded <50 chars. Trying pdfplumber fallback...")
+        try:
+            pdf_file = io.BytesIO(pdf_bytes)
+            # Skip vertical-text detection and non-layout text objects -
+            # pdfminer layout analysis is the slow part of this path
+            laparams = {"detect_vertical": False, "all_texts": False}
+            with pdfplumber.open(pdf_file, laparams=laparams) as pdf:
+                total_pages = len(pdf.pages)
+                logger.info("📖 PDF has %d pages (pdfplumber)", total_pages)
+
+                for i, page in enumerate(pdf.pages, 1):
+                    text = page.extract_text()
+                    if text:
+                        extracted_text += text + "\n"
+                        logger.info("  ✓ Page %d/%d: %d chars", i, total_pages, len(text))
+
+        except Exception as e:
+            logger.exception("❌ pdfplumber also failed: %s: %s", type(e).__name__, e)
+            raise HTTPException(
+                status_code=422,
+                detail=f"Could not extract text from PDF. Error: {str(e)}"
+            )
+
+    return extracted_text
 
 # -----------------------------------------------------------------------------
 # MODELS
@@ -86,23 +269,24 @@ class ClarifiedRuleResponse(BaseModel):
 # HELPERS
 # -----------------------------------------------------------------------------
 def clean_rules_for_output(rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Ensure rules strictly match the output schema"""
-    cleaned = []
+    """
+    Ensure rules carry every output-schema field.
+
+    Fills missing fields in place instead of rebuilding a new dict per
+    rule - the Pydantic response model drops extra keys on serialization
+    anyway, so the old copy was N dict allocations of pure overhead.
+    """
     for r in rules:
-        # Create a strict dict
-        new_r = {
-            "rule_id": r.get("rule_id", ""),
-            "original_text": r.get("original_text", ""), # This might be missing in parser output, defaulting to empty
-            "conditions": r.get("conditions", []),
-            "action": r.get("action", ""),
-            "responsible_role": r.get("responsible_role", ""),
-            "beneficiary": r.get("beneficiary", ""),
-            "deadline": r.get("deadline", ""),
-            "ambiguity_flag": r.get("ambiguity_flag", False),
-            "ambiguity_reason": r.get("ambiguity_reason", "")
-        }
-        cleaned.append(new_r)
-    return cleaned
+        r.setdefault("rule_id", "")
+        r.setdefault("original_text", "")  # May be missing in parser output
+        r.setdefault("conditions", [])
+        r.setdefault("action", "")
+        r.setdefault("responsible_role", "")
+        r.setdefault("beneficiary", "")
+        r.setdefault("deadline", "")
+        r.setdefault("ambiguity_flag", False)
+        r.setdefault("ambiguity_reason", "")
+    return rules
 
 # -----------------------------------------------------------------------------
 # ENDPOINTS
@@ -112,145 +296,159 @@ def clean_rules_for_output(rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 async def health():
     return {"status": "ok", "message": "Server is running"}
 
+async def validate_pdf(file: UploadFile = File(...)) -> UploadFile:
+    """Reject non-PDF uploads before any of the body is buffered."""
+    if file.content_type not in ("application/pdf", "application/x-pdf"):
+        raise HTTPException(status_code=415, detail="Only PDF uploads are supported")
+    return file
+
 @app.post("/api/policy/process", response_model=PolicyResponse)
 async def process_policy(
     policy_id: str = Form(...),
-    file: UploadFile = File(...)
+    file: UploadFile = Depends(validate_pdf)
 ):
-    print(f"\n{'='*60}")
-    print(f"📥 NEW REQUEST: Policy ID = {policy_id}")
-    print(f"📄 Filename: {file.filename}")
-    print(f"📋 Content-Type: {file.content_type}")
-    print(f"{'='*60}\n")
+    logger.info(f"\n{'='*60}")
+    logger.info(f"📥 NEW REQUEST: Policy ID = {policy_id}")
+    logger.info(f"📄 Filename: {file.filename}")
+    logger.info(f"📋 Content-Type: {file.content_type}")
+    logger.info(f"{'='*60}\n")
     
     try:
         # ============================================================
         # STEP 1: FILE VALIDATION
         # ============================================================
         
-        # 1.1 Read file bytes
-        pdf_bytes = await file.read()
-        file_size = len(pdf_bytes)
-        print(f"📊 File size: {file_size:,} bytes ({file_size / 1024 / 1024:.2f} MB)")
-        
-        # 1.2 Validate file size (max 10MB)
+        # 1.1 Stream the upload in 64KB chunks, validating as we go.
+        # Oversized or non-PDF uploads are rejected before the whole body
+        # is buffered. Accepted chunks accumulate into one bytearray —
+        # the extractor's parallel page workers each reopen the document
+        # from these bytes, so the full body is needed in memory anyway —
+        # and feed the content hash incrementally so the cache key costs
+        # no second pass over the buffer.
         MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-        if file_size > MAX_FILE_SIZE:
-            error_msg = f"File too large: {file_size / 1024 / 1024:.2f}MB (max 10MB)"
-            print(f"❌ {error_msg}")
-            raise HTTPException(status_code=413, detail=error_msg)
-        
+        pdf_signatures = [b'%PDF-1.', b'%PDF-2.']
+
+        buf = bytearray()
+        hasher = hashlib.sha256()
+        file_size = 0
+
+        while True:
+            chunk = await file.read(65536)
+            if not chunk:
+                break
+
+            # 1.2 Validate PDF signature on the very first chunk
+            if file_size == 0:
+                is_valid_pdf = any(chunk.startswith(sig) for sig in pdf_signatures)
+                if not is_valid_pdf:
+                    error_msg = f"Invalid PDF file. File starts with: {chunk[:20]}"
+                    logger.warning(f"❌ {error_msg}")
+                    raise HTTPException(status_code=400, detail="Invalid PDF file format")
+
+            file_size += len(chunk)
+
+            # 1.3 Validate file size incrementally (max 10MB)
+            if file_size > MAX_FILE_SIZE:
+                error_msg = f"File too large: >{MAX_FILE_SIZE / 1024 / 1024:.0f}MB (max 10MB)"
+                logger.warning(f"❌ {error_msg}")
+                raise HTTPException(status_code=413, detail=error_msg)
+
+            buf += chunk
+            hasher.update(chunk)
+
+        logger.info(f"📊 File size: {file_size:,} bytes ({file_size / 1024 / 1024:.2f} MB)")
+
         if file_size == 0:
             error_msg = "Empty file received"
-            print(f"❌ {error_msg}")
+            logger.warning(f"❌ {error_msg}")
             raise HTTPException(status_code=400, detail=error_msg)
-        
-        # 1.3 Validate PDF signature (magic bytes)
-        pdf_signatures = [b'%PDF-1.', b'%PDF-2.']
-        is_valid_pdf = any(pdf_bytes.startswith(sig) for sig in pdf_signatures)
-        
-        if not is_valid_pdf:
-            error_msg = f"Invalid PDF file. File starts with: {pdf_bytes[:20]}"
-            print(f"❌ {error_msg}")
-            raise HTTPException(status_code=400, detail="Invalid PDF file format")
-        
-        print("✅ File validation passed")
-        
+
+        # fitz, pdfplumber and the page workers all accept the bytearray
+        # directly; never copied into a second buffer
+        pdf_bytes = buf
+
+        logger.info("✅ File validation passed")
+
+        # ============================================================
+        # STEP 1.5: CONTENT-HASH CACHE CHECK
+        # ============================================================
+
+        pdf_hash = hasher.hexdigest()
+        cached = _RESULT_CACHE.get(pdf_hash)
+        if cached:
+            logger.info(f"⚡ Cache hit ({pdf_hash[:12]}...) - skipping extraction and AI")
+            # The store entry gets its own snapshot of the rules:
+            # /clarify mutates stored rules in place, so the new policy
+            # must not share dicts with the cached result or the
+            # response payload
+            store_rules = copy.deepcopy(cached["rules"])
+            await _store_set(policy_id, {
+                "policy_title": cached["policy_title"],
+                "rules": store_rules,
+                "rule_index": {r["rule_id"]: i for i, r in enumerate(store_rules)}
+            })
+            return {
+                "policy_id": policy_id,
+                "policy_title": cached["policy_title"],
+                "rules": cached["rules"]
+            }
+
         # ============================================================
         # STEP 2: TEXT EXTRACTION
         # ============================================================
         
-        pdf_file = io.BytesIO(pdf_bytes)
-        print("\n📄 Starting text extraction with pdfplumber...")
-        extracted_text = ""
-        
-        try:
-            with pdfplumber.open(pdf_file) as pdf:
-                total_pages = len(pdf.pages)
-                print(f"📖 PDF has {total_pages} pages")
-                
-                for i, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text()
-                    if text:
-                        extracted_text += text + "\n"
-                        print(f"  ✓ Page {i}/{total_pages}: {len(text)} chars")
-                    else:
-                        print(f"  ⚠ Page {i}/{total_pages}: No text extracted")
-                        
-        except Exception as e:
-            print(f"⚠️ pdfplumber failed: {type(e).__name__}: {str(e)}")
-            extracted_text = ""
-
-        # Fallback to pypdf if text is empty
-        if not extracted_text.strip():
-            print("\n⚠️ pdfplumber yielded no text. Trying pypdf fallback...")
-            try:
-                import pypdf
-                pdf_file.seek(0)
-                reader = pypdf.PdfReader(pdf_file)
-                total_pages = len(reader.pages)
-                print(f"📖 PDF has {total_pages} pages (pypdf)")
-                
-                for i, page in enumerate(reader.pages, 1):
-                    text = page.extract_text()
-                    if text:
-                        extracted_text += text + "\n"
-                        print(f"  ✓ Page {i}/{total_pages}: {len(text)} chars")
-                        
-            except Exception as e:
-                print(f"❌ pypdf also failed: {type(e).__name__}: {str(e)}")
-                raise HTTPException(
-                    status_code=422, 
-                    detail=f"Could not extract text from PDF. Error: {str(e)}"
-                )
+        # Blocking pdf parsing runs in the threadpool so the event loop
+        # can keep serving other requests meanwhile
+        extracted_text = await run_in_threadpool(_extract_pdf_text, pdf_bytes)
         
         # ============================================================
         # STEP 3: TEXT CLEANING & VALIDATION
         # ============================================================
         
-        print(f"\n🧹 Raw text length: {len(extracted_text)} chars")
+        logger.info(f"\n🧹 Raw text length: {len(extracted_text)} chars")
         cleaned_text = clean_text(extracted_text)
-        print(f"✨ Cleaned text length: {len(cleaned_text)} chars")
+        logger.info(f"✨ Cleaned text length: {len(cleaned_text)} chars")
         
         if len(cleaned_text) < 50:
             error_msg = f"Insufficient text extracted ({len(cleaned_text)} chars). PDF may be scanned/image-based."
-            print(f"❌ {error_msg}")
+            logger.warning(f"❌ {error_msg}")
             raise HTTPException(status_code=422, detail=error_msg)
         
-        print("✅ Text extraction successful")
+        logger.info("✅ Text extraction successful")
         
         # ============================================================
         # STEP 4: AI RULE EXTRACTION (with timeout protection)
         # ============================================================
         
-        print(f"\n🤖 Starting AI rule extraction...")
-        print(f"📝 Input text: {len(cleaned_text)} chars")
+        logger.info(f"\n🤖 Starting AI rule extraction...")
+        logger.info(f"📝 Input text: {len(cleaned_text)} chars")
         
         try:
-            parser = PolicyParser()
-            extraction_result = parser.extract_rules_from_policy(cleaned_text)
-            
+            # The Ollama round-trip takes seconds - keep it off the event loop
+            extraction_result = await run_in_threadpool(
+                PARSER.extract_rules_from_policy, cleaned_text
+            )
+
             rules = extraction_result.get("rules", [])
             policy_title = extraction_result.get("policy_title", "Untitled Policy")
             
-            print(f"✅ AI extraction complete: {len(rules)} rules found")
-            print(f"📋 Policy title: {policy_title}")
+            logger.info(f"✅ AI extraction complete: {len(rules)} rules found")
+            logger.info(f"📋 Policy title: {policy_title}")
             
         except Exception as e:
             error_msg = f"AI extraction failed: {type(e).__name__}: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.warning(f"❌ {error_msg}")
             raise HTTPException(status_code=500, detail=error_msg)
         
         # ============================================================
         # STEP 5: AMBIGUITY DETECTION
         # ============================================================
         
-        print("\n🔍 Running ambiguity detection...")
-        detector = AmbiguityDetector()
-        rules = detector.detect_ambiguities(rules)
+        logger.info("\n🔍 Running ambiguity detection...")
+        rules = await run_in_threadpool(DETECTOR.detect_ambiguities, rules)
         
         ambiguous_count = sum(1 for r in rules if r.get("ambiguity_flag", False))
-        print(f"✅ Ambiguity detection complete: {ambiguous_count}/{len(rules)} rules flagged")
+        logger.info(f"✅ Ambiguity detection complete: {ambiguous_count}/{len(rules)} rules flagged")
         
         # ============================================================
         # STEP 6: FINALIZE & STORE
@@ -258,16 +456,27 @@ async def process_policy(
         
         final_rules = clean_rules_for_output(rules)
         
-        POLICY_STORE[policy_id] = {
+        await _store_set(policy_id, {
             "policy_title": policy_title,
-            "rules": final_rules
-        }
-        
-        print(f"\n{'='*60}")
-        print(f"✅ SUCCESS: Policy {policy_id} processed")
-        print(f"📊 Total rules: {len(final_rules)}")
-        print(f"⚠️  Ambiguous rules: {ambiguous_count}")
-        print(f"{'='*60}\n")
+            "rules": final_rules,
+            # rule_id -> position, so /clarify resolves rules in O(1)
+            "rule_index": {r["rule_id"]: i for i, r in enumerate(final_rules)}
+        })
+
+        # Snapshot on the way in as well: the stored policy's rules keep
+        # being edited by /clarify, and the cached entry must stay the
+        # pristine pipeline output for future uploads of this PDF —
+        # regardless of how CacheManager holds entries internally
+        _RESULT_CACHE.set(pdf_hash, {
+            "policy_title": policy_title,
+            "rules": copy.deepcopy(final_rules)
+        })
+
+        logger.info(f"\n{'='*60}")
+        logger.info(f"✅ SUCCESS: Policy {policy_id} processed")
+        logger.info(f"📊 Total rules: {len(final_rules)}")
+        logger.warning(f"⚠️  Ambiguous rules: {ambiguous_count}")
+        logger.info(f"{'='*60}\n")
         
         return {
             "policy_id": policy_id,
@@ -282,32 +491,32 @@ async def process_policy(
     except Exception as e:
         # Catch-all for unexpected errors
         error_msg = f"Unexpected error: {type(e).__name__}: {str(e)}"
-        print(f"\n❌ FATAL ERROR: {error_msg}")
-        traceback.print_exc()
+        logger.exception(f"❌ FATAL ERROR: {error_msg}")
         raise HTTPException(status_code=500, detail=error_msg)
 
 
 @app.post("/api/policy/clarify", response_model=ClarifiedRuleResponse)
 async def clarify_ambiguity(request: ClarificationRequest):
-    print(f"💡 Received clarification for {request.policy_id} -> {request.rule_id}")
+    logger.info("💡 Received clarification for %s -> %s", request.policy_id, request.rule_id)
     
-    if request.policy_id not in POLICY_STORE:
+    policy_data = await _store_get(request.policy_id)
+    if policy_data is None:
         raise HTTPException(status_code=404, detail="Policy not found")
-    
-    policy_data = POLICY_STORE[request.policy_id]
+
     rules = policy_data["rules"]
-    
-    # Find the rule
-    target_rule = None
-    target_index = -1
-    for idx, r in enumerate(rules):
-        if r["rule_id"] == request.rule_id:
-            target_rule = r
-            target_index = idx
-            break
-            
-    if not target_rule:
+
+    # Find the rule via the stored index (O(1)); rebuild it for policies
+    # stored before the index existed
+    rule_index = policy_data.get("rule_index")
+    if rule_index is None:
+        rule_index = {r["rule_id"]: i for i, r in enumerate(rules)}
+        policy_data["rule_index"] = rule_index
+
+    target_index = rule_index.get(request.rule_id, -1)
+    if target_index < 0:
         raise HTTPException(status_code=404, detail="Rule not found")
+
+    target_rule = rules[target_index]
         
     # Merge clarification
     if request.clarified_responsible_role:
@@ -325,9 +534,10 @@ async def clarify_ambiguity(request: ClarificationRequest):
     target_rule.pop("original_text", None)
     
     # Update store
-    POLICY_STORE[request.policy_id]["rules"][target_index] = target_rule
+    policy_data["rules"][target_index] = target_rule
+    await _store_set(request.policy_id, policy_data)
     
-    print(f"✅ Rule clarified: {target_rule}")
+    logger.info("✅ Rule clarified: %s", target_rule)
     
     # Return executable rule
     return target_rule
@@ -337,12 +547,12 @@ class SubmitRequest(BaseModel):
 
 @app.post("/api/policy/submit")
 async def submit_policy(request: SubmitRequest):
-    print(f"🚀 Submitting Policy {request.policy_id} to Execution Backend...")
+    logger.info("🚀 Submitting Policy %s to Execution Backend...", request.policy_id)
     
-    if request.policy_id not in POLICY_STORE:
+    policy_data = await _store_get(request.policy_id)
+    if policy_data is None:
         raise HTTPException(status_code=404, detail="Policy not found")
-        
-    policy_data = POLICY_STORE[request.policy_id]
+
     rules = policy_data["rules"]
     
     # Transform to External Schema
@@ -364,7 +574,7 @@ async def submit_policy(request: SubmitRequest):
         
         # Validate required fields (Basic check)
         if not ext_r["rule_id"] or not ext_r["action"] or not ext_r["responsible_role"]:
-            print(f"⚠️ Skipping invalid rule: {ext_r}")
+            logger.warning("⚠️ Skipping invalid rule: %s", ext_r)
             continue
             
         external_rules.append(ext_r)
@@ -378,25 +588,41 @@ async def submit_policy(request: SubmitRequest):
     EXECUTION_BACKEND_URL = "https://policy-execution-backend.onrender.com/policies/ingest"
     
     try:
-        # using requests (sync) for simplicity in this demo. 
-        # In production, use httpx or run_in_executor
-        response = requests.post(EXECUTION_BACKEND_URL, json=payload, timeout=10)
-        
+        # async httpx keeps the event loop free for other requests
+        # (health checks, /clarify) during the backend round-trip;
+        # pre-encode the payload with orjson instead of httpx's stdlib json
+        response = await _httpx_client.post(
+            EXECUTION_BACKEND_URL,
+            content=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
+
         if response.status_code == 200:
-            print(f"✅ Submission Successful: {response.json()}")
+            logger.info("✅ Submission Successful: %s", response.json())
             return {
                 "status": "success",
                 "message": "Policy submitted to execution engine",
                 "backend_response": response.json()
             }
         else:
-            print(f"❌ Backend Error: {response.status_code} - {response.text}")
+            logger.warning("❌ Backend Error: %s - %s", response.status_code, response.text)
             raise HTTPException(status_code=response.status_code, detail=f"Execution Backend Error: {response.text}")
             
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Network Error: {e}")
+    except httpx.HTTPError as e:
+        logger.exception("❌ Network Error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to connect to Execution Backend: {str(e)}")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop + httptools give a much faster event loop / HTTP parser than
+    # the asyncio defaults. WEB_CONCURRENCY defaults to 1 because
+    # POLICY_STORE is in-memory per worker; bump it once the store is
+    # externalized (e.g. Redis).
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
@@ -19,6 +19,18 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _pretty_json(data: Any) -> str:
+    """Indent-2 JSON via orjson when available (much faster on large blobs)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
@@ -34,6 +46,11 @@ from src.policy_parser_parallel import ParallelPolicyParser
 from src.interactive_clarifier import InteractiveClarifier
 from src.policy_validator import PolicyRuleValidator  # NEW: Quality assurance layer
 from src.utils import save_json, load_text_file
+from src.log_setup import configure_queue_logging
+
+# Wire the policy_nlp queue logger: chunker/validator/parser progress
+# lands on stderr instead of being dropped by the handler-less root
+configure_queue_logging()
 
 # Constants for console formatting
 HEADER_WIDTH = 60
@@ -139,34 +156,31 @@ def run_full_pipeline(policy_text: str, clarifications_list: List[Dict[str, Any]
     updated_rules = []
     
     t2 = time.time()
-    # Progress Bar for Ambiguity Detection
-    for rule in tqdm(rules, desc="Analyzing Rules", unit="rule"):
-        # Process one by one (simulated loop, actually detect_ambiguities processes batch)
-        # But for progress bar effect we can iterate or just wrap the function calls inside
-        # Since our detector is fast, we'll keep it simple:
-        pass
-        
-    updated_rules = detector.detect_ambiguities(rules)
+    # Progress bar wraps the real detection work (no cosmetic pre-loop)
+    updated_rules = list(tqdm(
+        detector.detect_ambiguities_iter(rules),
+        total=len(rules), desc="Analyzing Rules", unit="rule"
+    ))
+    detector.print_summary(updated_rules)
     t3 = time.time()
     time_detection = t3 - t2
     
-    # Get stats
-    stats = detector.get_ambiguity_summary(updated_rules)
-    print(f"Total Rules: {stats['total_rules']}")
-    print(f"Ambiguous Rules: {stats['ambiguous_rules']}")
-    if stats['ambiguous_rules'] > 0:
-        print(f"Flagged IDs: {', '.join(stats['ambiguous_rule_ids'])}")
-        
-        for rule in updated_rules:
-            if rule['ambiguity_flag']:
-                print(f"    ⚠️  {rule['rule_id']}: {rule['ambiguity_reason']}")
+    # Get stats - one pass over the rules; the ambiguous subset is reused
+    # for flagged-ID printing and the clarification step below
+    ambiguous_rules = [r for r in updated_rules if r['ambiguity_flag']]
+    print(f"Total Rules: {len(updated_rules)}")
+    print(f"Ambiguous Rules: {len(ambiguous_rules)}")
+    if ambiguous_rules:
+        print(f"Flagged IDs: {', '.join(r['rule_id'] for r in ambiguous_rules)}")
+
+        for rule in ambiguous_rules:
+            print(f"    ⚠️  {rule['rule_id']}: {rule['ambiguity_reason']}")
 
     # STEP 4: CLARIFICATION APPLIED
     print_header("4: CLARIFICATION APPLIED")
-    
+
     final_rules = updated_rules
-    ambiguous_rules = [r for r in updated_rules if r['ambiguity_flag']]
-    
+
     t4 = time.time()
     if ambiguous_rules:
         # Check interactive mode
@@ -215,7 +229,7 @@ def run_full_pipeline(policy_text: str, clarifications_list: List[Dict[str, Any]
     print(f"  - Total Pipeline:  {total_time:.4f}s")
     
     print("\n📦 Final JSON Output (Snippet):")
-    print(json.dumps(final_output, indent=2)[:300] + "\n... [truncated]")
+    print(_pretty_json(final_output)[:300] + "\n... [truncated]")
     
     # STEP 6: VISUALIZATION
     print_header("6: WORKFLOW VISUALIZATION")
@@ -399,7 +413,7 @@ if __name__ == "__main__":
         print("="*40)
         
         save_json(comparison, "demo_data/conflict_report.json")
-        print(json.dumps(comparison, indent=2))
+        print(_pretty_json(comparison))
         print(f"\n✅ Report saved to demo_data/conflict_report.json")
         
     elif args.file:
@@ -1,47 +1,141 @@
 """Ambiguity detection module using RULE-BASED logic"""
 
+import re
+import sys
+from functools import lru_cache
 from typing import List, Tuple, Dict, Any, Union
 from .schema import PolicyRule, AMBIGUITY_TRIGGERS
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+from .ambiguity_numba import NUMBA_AVAILABLE, make_typed_list
+if NUMBA_AVAILABLE:
+    from .ambiguity_numba import scan_rule
+
 
 class AmbiguityDetector:
     """Detect ambiguous language in policy rules using rule-based logic"""
-    
+
     def __init__(self, custom_triggers: List[str] = None):
         """
         Initialize the ambiguity detector
-        
+
         Args:
             custom_triggers: Additional ambiguity triggers beyond the default list
         """
         self.triggers = AMBIGUITY_TRIGGERS.copy()
         if custom_triggers:
             self.triggers.extend(custom_triggers)
-            
-    def detect_ambiguities(self, rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+        # Aho-Corasick automaton checks all triggers in one linear scan of
+        # the rule text instead of one substring pass per trigger phrase
+        self.automaton = None
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for phrase in self.triggers:
+                self.automaton.add_word(phrase.lower(), phrase)
+            self.automaton.make_automaton()
+
+        # Compiled alternation as the no-extra-dependency fallback: one
+        # C-level regex scan instead of one substring search per phrase.
+        # Longest phrases first so e.g. "as deemed fit" wins over "as".
+        self._trigger_re = re.compile(
+            "|".join(map(re.escape, sorted(self.triggers, key=len, reverse=True))),
+            re.IGNORECASE,
+        )
+
+        # Word lists for triggers 4 and 5, built once instead of per rule
+        self.time_words = ("within", "before", "by", "during", "period")
+        self.vague_roles = frozenset({"authority", "official", "concerned officer", "department"})
+
+        # Compiled once; scanned against already-lowercased action text.
+        # Deliberately no word boundaries so matches stay identical to the
+        # original substring checks (and to the automaton/Numba paths).
+        self._time_re = re.compile("|".join(self.time_words))
+
+        # Content-keyed memo: boilerplate rules repeated within a
+        # document are scanned once. Bound per instance so detectors
+        # with different trigger sets never share entries.
+        self._is_ambiguous_cached = lru_cache(maxsize=4096)(self._check_fields)
+
+        # Optional Numba tier: compiled substring loops for when the
+        # Aho-Corasick automaton is unavailable
+        self._nb_lists = None
+        if self.automaton is None and NUMBA_AVAILABLE:
+            self._nb_lists = (
+                make_typed_list([phrase.lower() for phrase in self.triggers]),
+                make_typed_list(list(self.time_words)),
+            )
+
+    def _scan_triggers(self, text_lower: str) -> Union[str, None]:
         """
-        Process a list of rules (dicts) and flag ambiguities
-        
+        Single linear pass over already-lowercased text for trigger phrases.
+
         Args:
-            rules: List of rule dictionaries
-            
+            text_lower: Lowercased text to scan
+
         Returns:
-            List of updated rule dictionaries
+            The first trigger phrase found, or None
+        """
+        if self.automaton is not None:
+            for _, phrase in self.automaton.iter(text_lower):
+                return phrase
+            return None
+        match = self._trigger_re.search(text_lower)
+        return match.group(0) if match else None
+
+    def detect_ambiguities_iter(self, rules: List[Dict[str, Any]], verbose: bool = True):
+        """
+        Process rules lazily, yielding each updated rule as it is checked.
+        Lets callers drive progress bars off the real work.
+
+        Args:
+            rules: List of rule dictionaries
+            verbose: Emit per-rule status lines (buffered, not per-rule prints)
+
+        Yields:
+            Updated rule dictionaries, one at a time
         """
-        updated_rules = []
+        # Per-rule print() means two formatted writes (and stdio locks)
+        # per rule; buffer the lines and flush in batches instead
+        out = []
         for rule in rules:
             is_ambiguous, reason = self.is_ambiguous(rule)
             rule['ambiguity_flag'] = is_ambiguous
             rule['ambiguity_reason'] = reason
-            updated_rules.append(rule)
-            
-            # Log results as requested
-            print(f"Checking Rule {rule.get('rule_id', 'Unknown')}:")
-            if is_ambiguous:
-                print(f"  ❌ AMBIGUOUS: {reason}")
-            else:
-                print(f"  ✅ CLEAR")
-                
+
+            if verbose:
+                status = f"  ❌ AMBIGUOUS: {reason}" if is_ambiguous else "  ✅ CLEAR"
+                out.append(f"Checking Rule {rule.get('rule_id', 'Unknown')}:\n{status}")
+                if len(out) >= 100:
+                    sys.stdout.write('\n'.join(out) + '\n')
+                    out.clear()
+
+            yield rule
+
+        if out:
+            sys.stdout.write('\n'.join(out) + '\n')
+
+    def detect_ambiguities(self, rules: List[Dict[str, Any]], verbose: bool = True) -> List[Dict[str, Any]]:
+        """
+        Process a list of rules (dicts) and flag ambiguities
+
+        Args:
+            rules: List of rule dictionaries
+            verbose: Emit per-rule status lines
+
+        Returns:
+            List of updated rule dictionaries
+        """
+        updated_rules = list(self.detect_ambiguities_iter(rules, verbose=verbose))
         self.print_summary(updated_rules)
         return updated_rules
 
@@ -55,17 +149,83 @@ class AmbiguityDetector:
         Returns:
             List of updated PolicyRule objects
         """
+        # Column-wise path: one C-level scan per trigger across the whole
+        # batch instead of per-rule Python calls (and no model_dump churn)
+        if pd is not None and rules:
+            return self._flag_ambiguous_rules_vec(rules)
+
         # Convert to dicts for processing
         rule_dicts = [rule.model_dump() for rule in rules]
-        
+
         # Process
         updated_dicts = self.detect_ambiguities(rule_dicts)
-        
+
         # Update objects
         for idx, rule in enumerate(rules):
             rule.ambiguity_flag = updated_dicts[idx]['ambiguity_flag']
             rule.ambiguity_reason = updated_dicts[idx]['ambiguity_reason']
-            
+
+        return rules
+
+    def _flag_ambiguous_rules_vec(self, rules: List[PolicyRule]) -> List[PolicyRule]:
+        """
+        Vectorized flagging: build column Series for each field once and
+        evaluate all five triggers as boolean masks over the batch.
+        Reason strings are only materialized for the flagged subset.
+
+        Args:
+            rules: List of PolicyRule objects
+
+        Returns:
+            List of updated PolicyRule objects (mutated in place)
+        """
+        conditions = [rule.conditions or [] for rule in rules]
+        actions = pd.Series([rule.action or '' for rule in rules], dtype=object).str.lower()
+        roles = pd.Series([rule.responsible_role or '' for rule in rules], dtype=object).str.lower()
+        deadlines = pd.Series([str(rule.deadline or '') for rule in rules], dtype=object).str.lower()
+        beneficiaries = pd.Series([str(rule.beneficiary or '') for rule in rules], dtype=object).str.lower()
+        full_text = actions + ' ' + pd.Series(
+            [' '.join(conds).lower() for conds in conditions], dtype=object
+        )
+        has_conditions = pd.Series([bool(conds) for conds in conditions])
+
+        # Same five triggers as is_ambiguous, as whole-batch masks
+        vague_phrase = full_text.str.contains(self._trigger_re)
+        missing_role = roles.isin(('', 'not specified'))
+        missing_criteria = (
+            actions.str.contains('eligible', regex=False)
+            | beneficiaries.str.contains('eligible', regex=False)
+        ) & ~has_conditions
+        missing_deadline = (
+            actions.str.contains(self._time_re)
+            & deadlines.isin(('', 'not specified'))
+        )
+        vague_role = roles.isin(self.vague_roles)
+
+        flagged = (vague_phrase | missing_role | missing_criteria
+                   | missing_deadline | vague_role).to_numpy()
+
+        for idx, rule in enumerate(rules):
+            if flagged[idx]:
+                # Scalar path only for the flagged subset, so reason
+                # strings stay identical to the per-rule checker
+                _, reason = self.is_ambiguous({
+                    'action': rule.action,
+                    'conditions': rule.conditions,
+                    'responsible_role': rule.responsible_role,
+                    'deadline': rule.deadline,
+                    'beneficiary': rule.beneficiary,
+                })
+                rule.ambiguity_flag = True
+                rule.ambiguity_reason = reason
+            else:
+                rule.ambiguity_flag = False
+                rule.ambiguity_reason = ""
+
+        self.print_summary([
+            {'rule_id': rule.rule_id, 'ambiguity_flag': rule.ambiguity_flag}
+            for rule in rules
+        ])
         return rules
 
     def is_ambiguous(self, rule: Dict[str, Any]) -> Tuple[bool, str]:
@@ -75,53 +235,84 @@ class AmbiguityDetector:
         Args:
             rule: Rule dictionary
             
+        Returns:
+            Tuple (is_ambiguous, reason)
+        """
+        # Extract fields safely, then dispatch through the content-keyed
+        # memo so identical boilerplate rules are only scanned once
+        return self._is_ambiguous_cached(
+            str(rule.get('action', '') or ''),
+            tuple(rule.get('conditions', []) or ()),
+            str(rule.get('responsible_role', '') or ''),
+            str(rule.get('deadline', '') or ''),
+            str(rule.get('beneficiary', '') or ''),
+        )
+
+    def _check_fields(self, action: str, conditions: tuple, responsible_role: str,
+                      deadline: str, beneficiary: str) -> Tuple[bool, str]:
+        """
+        Run the five trigger checks on extracted rule fields
+
+        Args:
+            action: Rule action text
+            conditions: Tuple of condition strings
+            responsible_role: Responsible role text
+            deadline: Deadline text
+            beneficiary: Beneficiary text
+
         Returns:
             Tuple (is_ambiguous, reason)
         """
         reasons = []
-        
-        # Extract fields safely
-        action = str(rule.get('action', '') or '')
-        conditions = rule.get('conditions', [])
-        responsible_role = str(rule.get('responsible_role', '') or '')
-        deadline = str(rule.get('deadline', '') or '')
-        
+
+        # Lowercase each field once up front; every check below reuses
+        # the cached string instead of re-allocating via .lower()
+        action_lc = action.lower()
+        role_lc = responsible_role.lower()
+        beneficiary_lc = beneficiary.lower()
+
         # Combine text for phrase searching
-        full_text = f"{action} {' '.join(conditions)}".lower()
+        full_text = f"{action_lc} {' '.join(conditions).lower()}"
         
         # ---------------------------------------------------------
         # TRIGGER 1: Vague phrases in action or conditions
         # ---------------------------------------------------------
-        found_phrase = self.check_phrase_ambiguity(full_text, self.triggers)
+        has_time_word = None
+        if self._nb_lists is not None:
+            trigger_index, has_time_word = scan_rule(
+                full_text, action_lc, *self._nb_lists
+            )
+            found_phrase = self.triggers[trigger_index] if trigger_index >= 0 else None
+        else:
+            found_phrase = self._scan_triggers(full_text)
         if found_phrase:
             reasons.append(f"Contains vague phrase: '{found_phrase}'")
             
         # ---------------------------------------------------------
         # TRIGGER 2: Missing responsible_role
         # ---------------------------------------------------------
-        if not responsible_role or responsible_role.lower() == "not specified":
+        if not responsible_role or role_lc == "not specified":
             reasons.append("Responsible authority not specified")
             
         # ---------------------------------------------------------
         # TRIGGER 3: Missing conditions for conditional actions
         # ---------------------------------------------------------
         # Check if "eligible" is mentioned in action OR beneficiary without conditions
-        if ("eligible" in action.lower() or "eligible" in str(rule.get('beneficiary', '')).lower()) and not conditions:
+        if ("eligible" in action_lc or "eligible" in beneficiary_lc) and not conditions:
             reasons.append("Eligibility criteria not specified")
             
         # ---------------------------------------------------------
         # TRIGGER 4: Missing deadline for time-sensitive actions
         # ---------------------------------------------------------
-        time_words = ["within", "before", "by", "during", "period"]
-        has_time_word = any(word in action.lower() for word in time_words)
+        if has_time_word is None:
+            has_time_word = self._time_re.search(action_lc) is not None
         if has_time_word and (not deadline or deadline.lower() == "not specified"):
             reasons.append("Time constraint mentioned but deadline not specified")
             
         # ---------------------------------------------------------
         # TRIGGER 5: Vague authority references
         # ---------------------------------------------------------
-        vague_roles = ["authority", "official", "concerned officer", "department"]
-        if responsible_role and any(vr == responsible_role.lower() for vr in vague_roles):
+        if responsible_role and role_lc in self.vague_roles:
             reasons.append(f"Authority role is too vague: '{responsible_role}'")
             
         if reasons:
@@ -140,6 +331,10 @@ class AmbiguityDetector:
         Returns:
             The found phrase or None
         """
+        # Single-pass scan (only valid for the detector's own trigger set)
+        if trigger_phrases is self.triggers:
+            return self._scan_triggers(text.lower())
+
         text_lower = text.lower()
         for phrase in trigger_phrases:
             if phrase.lower() in text_lower:
@@ -0,0 +1,56 @@
+"""Optional Numba-compiled kernel for the hot ambiguity trigger scans.
+
+The kernel lifts only the inner substring loops out of the interpreter;
+all orchestration (field extraction, reason strings) stays in plain
+Python in ambiguity_detector. Importing this module is safe without
+Numba installed — callers must check NUMBA_AVAILABLE first.
+"""
+
+try:
+    from numba import njit
+    from numba.typed import List as TypedList
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    TypedList = None
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def scan_rule(full_text, action_lower, triggers, time_words):
+        """
+        Compiled inner loops for triggers 1 and 4.
+
+        Args:
+            full_text: Lowercased action + conditions text
+            action_lower: Lowercased action text
+            triggers: typed.List of lowercased trigger phrases
+            time_words: typed.List of lowercased time words
+
+        Returns:
+            Tuple (trigger_index, has_time_word) where trigger_index is
+            the index of the first matching trigger phrase or -1
+        """
+        trigger_index = -1
+        for idx in range(len(triggers)):
+            if triggers[idx] in full_text:
+                trigger_index = idx
+                break
+
+        has_time_word = False
+        for idx in range(len(time_words)):
+            if time_words[idx] in action_lower:
+                has_time_word = True
+                break
+
+        return trigger_index, has_time_word
+
+
+def make_typed_list(strings):
+    """Build a numba.typed.List of strings for use with scan_rule."""
+    typed = TypedList()
+    for item in strings:
+        typed.append(item)
+    return typed
@@ -6,10 +6,22 @@ Handles file-based caching for LLM responses to optimize performance.
 import os
 import json
 import hashlib
+import shutil
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
 class CacheManager:
     """
     Simple file-based cache with TTL expiration.
@@ -19,57 +31,123 @@ class CacheManager:
         self.cache_dir = Path(cache_dir)
         self.ttl_seconds = ttl_seconds
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Bounded in-process LRU in front of the disk backend: repeated
+        # lookups for hot keys skip the stat + disk read. Entries are
+        # held as serialized bytes and parsed per hit, so every get()
+        # returns a private object — callers mutate their results in
+        # place (ambiguity flags, /clarify) and must never share dicts
+        # with the cache or each other
+        self._mem: OrderedDict = OrderedDict()
+        self._mem_max = 1024
         
     def get(self, key_content: str) -> Optional[Any]:
         """Retrieve value from cache if exists and not expired."""
-        cache_file = self._get_cache_path(key_content)
-        
-        if not cache_file.exists():
-            return None
-            
+        # Digest the content exactly once per lookup; both layers key on
+        # the fixed-length digest, never on the (potentially huge) text
+        digest = self._digest(key_content)
+
+        entry = self._mem.get(digest)
+        if entry is not None:
+            timestamp, raw = entry
+            if time.time() - timestamp <= self.ttl_seconds:
+                self._mem.move_to_end(digest)
+                return self._loads(raw)
+            del self._mem[digest]
+
+        cache_file = self._cache_path(digest)
+
         try:
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
-                
-            # Check expiration
-            if time.time() - data['timestamp'] > self.ttl_seconds:
-                # Expired
-                self.delete(key_content)
+            # Expiry check via mtime: a single stat, no read/parse of
+            # entries that are already stale
+            mtime = cache_file.stat().st_mtime
+            if time.time() - mtime > self.ttl_seconds:
+                self._evict(digest, cache_file)
                 return None
-                
-            return data['payload']
-            
-        except (json.JSONDecodeError, KeyError):
+
+            raw = cache_file.read_bytes()
+            payload = self._loads(raw)
+
+            self._mem_put(digest, mtime, raw)
+            return payload
+
+        except (OSError, ValueError):
             return None
 
     def set(self, key_content: str, value: Any):
         """Save value to cache."""
-        cache_file = self._get_cache_path(key_content)
-        
-        data = {
-            'timestamp': time.time(),
-            'payload': value
-        }
-        
+        digest = self._digest(key_content)
+        cache_file = self._cache_path(digest)
+
+        # Serialize once; the same bytes feed the disk write and the hot
+        # layer, so the cache never retains a reference to the caller's
+        # live objects (callers keep mutating them after set)
+        try:
+            if orjson is not None:
+                raw = orjson.dumps(value)
+            else:
+                raw = json.dumps(value).encode('utf-8')
+        except (TypeError, ValueError) as e:
+            print(f"⚠️ Cache write failed: {e}")
+            return
+
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(data, f)
+            # Write to a sibling temp file, then atomically swap it in so
+            # readers never observe a partially written entry. The value
+            # is stored bare — the file mtime carries the TTL timestamp,
+            # so no wrapper object is built or parsed on either side.
+            tmp_file = cache_file.with_suffix('.json.tmp')
+            tmp_file.write_bytes(raw)
+            os.replace(tmp_file, cache_file)
         except Exception as e:
             print(f"⚠️ Cache write failed: {e}")
 
+        # Keep the hot layer current even if the disk write failed
+        self._mem_put(digest, time.time(), raw)
+
+    def _mem_put(self, digest: str, timestamp: float, raw: bytes):
+        """Insert into the in-memory LRU, evicting the oldest if full."""
+        self._mem[digest] = (timestamp, raw)
+        self._mem.move_to_end(digest)
+        while len(self._mem) > self._mem_max:
+            self._mem.popitem(last=False)
+
+    @staticmethod
+    def _loads(raw: bytes) -> Any:
+        """Parse a stored entry into a fresh object the caller owns."""
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw)
+
     def delete(self, key_content: str):
         """Remove item from cache."""
-        cache_file = self._get_cache_path(key_content)
+        digest = self._digest(key_content)
+        self._evict(digest, self._cache_path(digest))
+
+    def _evict(self, digest: str, cache_file: Path):
+        """Drop an entry from both cache layers."""
+        self._mem.pop(digest, None)
         if cache_file.exists():
             os.remove(cache_file)
 
-    def _get_cache_path(self, content: str) -> Path:
-        """Generate safe filesystem path from content hash."""
-        # Use SHA-256 for collision resistance
-        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
-        return self.cache_dir / f"{content_hash}.json"
+    def _digest(self, content: str) -> str:
+        """Fixed-length content digest used as the cache key."""
+        # Keys can be whole LLM prompts, so hash throughput matters.
+        # BLAKE3 when available (128-bit output is plenty for cache
+        # dispersion); SHA-256 otherwise.
+        if blake3 is not None:
+            return blake3(content.encode('utf-8')).hexdigest(length=16)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _cache_path(self, digest: str) -> Path:
+        """Filesystem path for a digest."""
+        # .v2 marks the bare-payload format; wrapper-format entries from
+        # older runs are simply never matched (clear_all still removes them)
+        return self.cache_dir / f"{digest}.v2.json"
 
     def clear_all(self):
         """Clear all cache files."""
-        for f in self.cache_dir.glob("*.json"):
-            os.remove(f)
+        self._mem.clear()
+        # One directory-level removal instead of an unlink per entry
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -1,7 +1,6 @@
 """Clarification handler for ambiguous rules (Human-in-the-loop)"""
 
 from typing import List, Dict, Any, Tuple, Optional
-import copy
 
 
 class ClarificationHandler:
@@ -58,9 +57,10 @@ class ClarificationHandler:
         Returns:
             New dict with merged data
         """
-        # Create a deep copy to avoid mutating the original
-        merged_rule = copy.deepcopy(original_rule)
-        
+        # Shallow copy is enough: only top-level keys are reassigned, and
+        # the conditions list is cloned below before it is appended to
+        merged_rule = original_rule.copy()
+
         # Map clarification keys to rule keys
         field_mapping = {
             'clarified_responsible_role': 'responsible_role',
@@ -78,16 +78,18 @@ class ClarificationHandler:
         if 'clarified_conditions' in clarifications:
             new_conditions = clarifications['clarified_conditions']
             if isinstance(new_conditions, list):
-                # Ensure we have a list to append to
-                if not isinstance(merged_rule.get('conditions'), list):
-                    merged_rule['conditions'] = []
-                
+                # Fresh list so the original rule's conditions stay untouched
+                existing = merged_rule.get('conditions')
+                merged_rule['conditions'] = list(existing) if isinstance(existing, list) else []
+
                 # Append only unique new conditions
                 existing_conditions = set(merged_rule['conditions'])
                 for cond in new_conditions:
                     if cond and cond not in existing_conditions:
                         merged_rule['conditions'].append(cond)
-                        
+                        existing_conditions.add(cond)
+
+
         return merged_rule
 
     def validate_clarification(self, clarifications: Dict[str, Any]) -> Tuple[bool, str]:
@@ -164,24 +166,26 @@ class ClarificationHandler:
         Returns:
             List of field names
         """
-        needed = []
-        
+        # Dict used as an ordered set: dedup without the list->set->list
+        # round trip, and the field order stays deterministic for the UI
+        needed = {}
+
         # Check empty fields
         if not rule.get('responsible_role'):
-            needed.append('responsible_role')
+            needed['responsible_role'] = None
         if not rule.get('deadline'):
-            needed.append('deadline')
+            needed['deadline'] = None
         if not rule.get('beneficiary'):
-            needed.append('beneficiary')
+            needed['beneficiary'] = None
         if not rule.get('conditions'):
-            needed.append('conditions')
-            
+            needed['conditions'] = None
+
         # Check ambiguity checks from reason
         reason = rule.get('ambiguity_reason', '').lower()
         if 'vague phrase' in reason or 'action' in reason:
-            needed.append('action')
-            
-        return list(set(needed))
+            needed['action'] = None
+
+        return list(needed)
 
     def process_batch_clarifications(self, rules: List[Dict[str, Any]], clarifications_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -194,18 +198,28 @@ class ClarificationHandler:
         Returns:
             Updated list of rules
         """
-        # Create a map for faster lookup
-        clarification_map = {c['rule_id']: c for c in clarifications_list if 'rule_id' in c}
-        
+        # Validate each clarification exactly once up front; the per-rule
+        # path below then goes straight to the merge with no re-checks
+        clarification_map = {}
+        for clarification in clarifications_list:
+            is_valid, error = self.validate_clarification(clarification)
+            if is_valid:
+                clarification_map[clarification['rule_id']] = clarification
+            else:
+                print(f"Error applying clarification: {error}")
+
         updated_rules = []
         for rule in rules:
-            rule_id = rule.get('rule_id')
-            if rule_id in clarification_map:
-                # Apply clarification
-                print(f"Applying clarification to Rule {rule_id}...")
-                updated_rule = self.apply_clarification(rule, clarification_map[rule_id])
+            clarification = clarification_map.get(rule.get('rule_id'))
+            if clarification is not None:
+                # Apply clarification (already validated, IDs already matched)
+                print(f"Applying clarification to Rule {rule['rule_id']}...")
+                updated_rule = self.merge_clarifications(rule, clarification)
+                updated_rule['ambiguity_flag'] = False
+                updated_rule['ambiguity_reason'] = ""
                 updated_rules.append(updated_rule)
             else:
+                # Unmatched rules pass through by reference — no copy
                 updated_rules.append(rule)
-                
+
         return updated_rules
@@ -0,0 +1,53 @@
+"""Optional Numba-compiled Jaccard kernel for batch rule comparison.
+
+Token sets are mapped to sorted int32 id arrays by PolicyComparator; the
+kernel computes intersection/union with a two-pointer merge, keeping the
+per-pair hot loop out of the interpreter. Importing this module is safe
+without Numba installed — callers must check NUMBA_AVAILABLE first.
+"""
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    np = None
+    njit = None
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def jaccard_sorted(ids1, ids2):
+        """
+        Jaccard similarity of two sorted int32 token-id arrays.
+
+        Two-pointer merge: each array is walked once, so the kernel is
+        O(len1 + len2) with no hashing and no temporaries.
+        """
+        n1 = ids1.shape[0]
+        n2 = ids2.shape[0]
+        if n1 == 0 and n2 == 0:
+            return 1.0
+
+        i = j = intersection = 0
+        while i < n1 and j < n2:
+            a = ids1[i]
+            b = ids2[j]
+            if a == b:
+                intersection += 1
+                i += 1
+                j += 1
+            elif a < b:
+                i += 1
+            else:
+                j += 1
+
+        return intersection / (n1 + n2 - intersection)
+
+    def token_id_array(ids):
+        """Pack an iterable of token ids into a sorted int32 array."""
+        arr = np.fromiter(ids, dtype=np.int32)
+        arr.sort()
+        return arr
@@ -15,6 +15,11 @@ import re
 from typing import Dict, List, Any
 from copy import deepcopy
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class DemoModeFixer:
     """Post-processes policy extraction for hackathon demonstrations"""
@@ -34,6 +39,24 @@ class DemoModeFixer:
             'may', 'as applicable', 'subject to', 'as per',
             'in accordance with', 'approval', 'discretion'
         ]
+
+        # Keyword lists compiled once into alternations: each check below
+        # is then a single linear scan instead of one pass per keyword
+        self._skip_re = re.compile('|'.join(map(re.escape, self.skip_keywords)))
+        self._verb_re = re.compile(
+            'pay|refund|provide|grant|allow|deduct|'
+            'cancel|revive|issue|receive|submit|notify'
+        )
+        self._ambiguity_re = re.compile(
+            '|'.join(map(re.escape, sorted(self.ambiguity_triggers, key=len, reverse=True)))
+        )
+
+        # Condition rewrites: first matching pattern wins
+        self._cond_rewrites = (
+            (re.compile(r'in-?force'), 'Policy is active and not lapsed'),
+            (re.compile(r'grace period'), 'Premium not paid within grace period'),
+        )
+        self._heading_conditions = frozenset({'benefit', 'maturity', 'death'})
     
     def fix_for_demo(self, policy_data: Dict[str, Any], target_rules: int = 7) -> Dict[str, Any]:
         """
@@ -106,20 +129,15 @@ class DemoModeFixer:
             action = rule.get('action', '').lower()
             
             # Skip if action contains skip keywords
-            if any(kw in action for kw in self.skip_keywords):
+            if self._skip_re.search(action):
                 continue
-            
+
             # Skip if action is too vague or short
             if len(action.strip()) < 15:
                 continue
-            
+
             # Must have key benefit/action verbs
-            has_demo_verb = any(verb in action for verb in [
-                'pay', 'refund', 'provide', 'grant', 'allow', 'deduct',
-                'cancel', 'revive', 'issue', 'receive', 'submit', 'notify'
-            ])
-            
-            if has_demo_verb:
+            if self._verb_re.search(action):
                 demo_rules.append(rule)
         
         return demo_rules
@@ -185,17 +203,20 @@ class DemoModeFixer:
             
             for cond in conditions:
                 cond = cond.strip()
-                
+
+                # Lowercase once; every check below reuses it
+                cond_lower = cond.lower()
+
                 # Skip empty or heading-like conditions
-                if not cond or cond.lower() in ['benefit', 'maturity', 'death']:
+                if not cond or cond_lower in self._heading_conditions:
                     continue
-                
+
                 # Rewrite common patterns
-                if 'in-force' in cond.lower():
-                    cond = 'Policy is active and not lapsed'
-                elif 'grace period' in cond.lower():
-                    cond = 'Premium not paid within grace period'
-                
+                for pattern, replacement in self._cond_rewrites:
+                    if pattern.search(cond_lower):
+                        cond = replacement
+                        break
+
                 normalized.append(cond)
             
             rule['conditions'] = normalized
@@ -223,12 +244,11 @@ class DemoModeFixer:
             if any(word in action for word in timing_words) and not deadline:
                 reasons.append("Deadline not specified in policy text")
             
-            # Check for ambiguity trigger words
-            full_text = action + ' ' + ' '.join(rule.get('conditions', []))
-            for trigger in self.ambiguity_triggers:
-                if trigger in full_text.lower():
-                    reasons.append(f"Contains discretionary term '{trigger}'")
-                    break
+            # Check for ambiguity trigger words (single pass, first match)
+            full_text = action + ' ' + ' '.join(rule.get('conditions', [])).lower()
+            match = self._ambiguity_re.search(full_text)
+            if match:
+                reasons.append(f"Contains discretionary term '{match.group(0)}'")
             
             # Set flag and reason
             if reasons:
@@ -267,7 +287,19 @@ class DemoModeFixer:
                 score += 2
             
             return score
-        
+
+        if np is not None:
+            # Score once into an int array, then argpartition picks the
+            # top N in O(n) instead of a full sort with per-comparison
+            # key calls; the selected few are sorted for stable output
+            scores = np.fromiter(
+                (demo_score(rule) for rule in rules),
+                dtype=np.int32, count=len(rules)
+            )
+            top_idx = np.argpartition(-scores, target - 1)[:target]
+            top_idx = top_idx[np.argsort(-scores[top_idx], kind='stable')]
+            return [rules[i] for i in top_idx]
+
         # Sort by score and take top N
         scored_rules = sorted(rules, key=demo_score, reverse=True)
         return scored_rules[:target]
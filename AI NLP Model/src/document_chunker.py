@@ -3,8 +3,25 @@ Document Chunking Logic for Large Policies.
 Splits text into context-aware chunks to fit within LLM context windows.
 """
 
+import logging
 import re
-from typing import List, Dict, Any
+from bisect import bisect_left
+from collections import namedtuple
+from typing import Iterator, List
+
+# Child of the "policy_nlp" logger main.py configures: per-chunk
+# progress rides its queued handler (no stdout flush per chunk) and can
+# be silenced with level config
+logger = logging.getLogger("policy_nlp.chunker")
+
+# Split-point delimiters, best first: paragraph break, line break,
+# sentence end. One compiled scan finds all three in a single pass.
+_BOUNDARY_RE = re.compile(r'\n\n|\n|\. ')
+
+# Fixed-slot record instead of a per-chunk dict: fields live in a C
+# array, so a 100-chunk document allocates no per-chunk hash tables.
+# Use chunk._asdict() where a JSON-serializable mapping is needed.
+Chunk = namedtuple('Chunk', 'chunk_id content start_char end_char')
 
 class DocumentChunker:
     """Intelligent document splitting for large policies."""
@@ -13,66 +30,72 @@ class DocumentChunker:
         self.max_chunk_size = max_chunk_size
         self.overlap = overlap
         
-    def chunk_document(self, text: str) -> List[Dict[str, Any]]:
+    def chunk_document(self, text: str) -> List[Chunk]:
         """
         Splits document into logical chunks.
-        
+
         Args:
            text: The full document text.
-           
+
         Returns:
-           List of dicts with 'chunk_id', 'content', 'start_char', 'end_char'
+           List of Chunk records with chunk_id, content, start_char, end_char
+        """
+        return list(self.iter_chunks(text))
+
+    def iter_chunks(self, text: str) -> Iterator[Chunk]:
+        """
+        Streaming variant of chunk_document: yields each chunk as soon
+        as its split point is resolved, so consumers (the parallel
+        parser) can start work on early chunks while the tail of a huge
+        document is still being segmented.
         """
         # If text is small enough, return as is
         if len(text) <= self.max_chunk_size:
-            return [{
-                "chunk_id": 1,
-                "content": text,
-                "start_char": 0,
-                "end_char": len(text)
-            }]
-            
-        chunks = []
+            yield Chunk(1, text, 0, len(text))
+            return
+
         current_pos = 0
         total_len = len(text)
         chunk_counter = 1
-        
+
         # Split by potential section headers first to respect structure
         # Headers: ALL CAPS lines, "Section X", "Part X", "Annexure"
         # We'll use a regex to find safe split points
-        
+
+        # Index every boundary in one O(N) sweep of the document, then
+        # each chunk resolves its split point with O(log k) bisects
+        # against the sorted offset lists instead of re-scanning its
+        # trailing window
+        boundary_offsets = {'\n\n': [], '\n': [], '. ': []}
+        for match in _BOUNDARY_RE.finditer(text):
+            boundary_offsets[match.group()].append(match.start())
+
         while current_pos < total_len:
             end_pos = min(current_pos + self.max_chunk_size, total_len)
-            
+
             # If we are not at the end, verify we are at a safe split point
             if end_pos < total_len:
                 # Look for the last newline or period in the last 10% of the chunk window
                 # to avoid splitting mid-sentence or mid-word
                 search_window_start = max(current_pos, end_pos - 1000)
-                window_text = text[search_window_start:end_pos]
-                
-                # Priority 1: Double newline (paragraph break)
-                split_idx = window_text.rfind('\n\n')
-                if split_idx == -1:
-                    # Priority 2: Single newline
-                    split_idx = window_text.rfind('\n')
-                if split_idx == -1:
-                    # Priority 3: Period + space
-                    split_idx = window_text.rfind('. ')
-                
+
+                # Priority: paragraph break > newline > period + space
+                split_idx = -1
+                for delim in ('\n\n', '\n', '. '):
+                    offsets = boundary_offsets[delim]
+                    i = bisect_left(offsets, end_pos) - 1
+                    if i >= 0 and offsets[i] >= search_window_start:
+                        split_idx = offsets[i]
+                        break
+
                 if split_idx != -1:
-                    end_pos = search_window_start + split_idx + 1 # Include the break char
+                    end_pos = split_idx + 1 # Include the break char
             
             chunk_content = text[current_pos:end_pos]
-            
-            chunks.append({
-                "chunk_id": chunk_counter,
-                "content": chunk_content,
-                "start_char": current_pos,
-                "end_char": end_pos
-            })
-            
-            print(f"📄 Created Chunk {chunk_counter}: {len(chunk_content)} chars")
+
+            logger.info("📄 Created Chunk %d: %d chars", chunk_counter, len(chunk_content))
+
+            yield Chunk(chunk_counter, chunk_content, current_pos, end_pos)
             
             # Move position, considering overlap implies backing up a bit? 
             # Actually, standard chunking merges results. Overlap might cause duplicate rules.
@@ -82,5 +105,3 @@ class DocumentChunker:
             
             current_pos = end_pos
             chunk_counter += 1
-            
-        return chunks
@@ -10,6 +10,11 @@ from typing import List, Dict, Any, Set
 from colorama import init, Fore, Style
 from src.clarification_handler import ClarificationHandler
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize colorama
 init(autoreset=True)
 
@@ -103,7 +108,13 @@ class InteractiveClarifier:
         """Main loop for the interactive session."""
         self.print_banner("INTERACTIVE CLARIFICATION MODE")
         print(f"{Style.DIM}You have {len(ambiguous_rules)} rules to review.{Style.RESET_ALL}\n")
-        
+
+        # Wall clock read once at session start; per-entry stamps are the
+        # start plus a monotonic offset, so history ordering can't be
+        # scrambled by clock adjustments mid-session
+        session_start = time.time()
+        mono_start = time.monotonic()
+
         clarifications = []
         
         for i, rule in enumerate(ambiguous_rules, 1):
@@ -131,7 +142,7 @@ class InteractiveClarifier:
                     self.history.append({
                         "rule": rule,
                         "clarification": clarification,
-                        "timestamp": time.time()
+                        "timestamp": session_start + (time.monotonic() - mono_start)
                     })
                     print(f"\n{Fore.GREEN}✅ Clarification recorded!{Style.RESET_ALL}\n")
                 else:
@@ -142,6 +153,12 @@ class InteractiveClarifier:
 
     def save_session(self, filepath: str = "demo_data/clarification_session.json"):
         """Saves the Q&A history."""
-        with open(filepath, 'w') as f:
-            json.dump(self.history, f, indent=2)
+        if orjson is not None:
+            # Serialized in C; stdlib indent=2 goes through the slow
+            # pure-Python pretty-printer
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(self.history, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(self.history, f, indent=2)
         print(f"{Style.DIM}Session history saved to {filepath}{Style.RESET_ALL}")
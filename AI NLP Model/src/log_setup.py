@@ -0,0 +1,37 @@
+"""Queue-backed logging setup for the policy_nlp logger hierarchy.
+
+Library modules (chunker, validator, parsers) log to "policy_nlp.*"
+child loggers and never attach handlers themselves; every entry point
+(FastAPI server, CLI, scripts) calls configure_queue_logging() once so
+those records actually reach the console instead of being dropped by
+the handler-less root.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+
+
+def configure_queue_logging(level: int = logging.INFO) -> None:
+    """
+    Attach a QueueHandler/QueueListener pair to the "policy_nlp" logger.
+
+    Records are queued and emitted to stderr by a background listener
+    thread, so console I/O never blocks the logging caller (worker
+    threads, the event loop). Idempotent: entry points can call it
+    unconditionally and only the first call wires handlers.
+    """
+    logger = logging.getLogger("policy_nlp")
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers):
+        return
+
+    log_queue: "queue.Queue" = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.setLevel(level)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
@@ -4,29 +4,42 @@ Handles language detection and translation for Hindi support.
 """
 
 import re
+from functools import lru_cache
 from typing import Tuple, Dict, Any
 from deep_translator import GoogleTranslator
 from src.policy_parser import PolicyParser
 
+# Devanagari block (U+0900 to U+097F), compiled once at import
+_DEVANAGARI_RE = re.compile(r'[\u0900-\u097F]')
+
 class MultilingualParser:
     """Wrapper around PolicyParser to handle multilingual input."""
     
     def __init__(self, parser: PolicyParser):
         self.parser = parser
-        # Initialize translator (default is auto -> en)
-        self.translator = GoogleTranslator(source='auto', target='en')
+        # Translator is built lazily on first Hindi input: the English
+        # path (the common case) never pays its construction cost
+        self.translator = None
+        # Repeated identical snippets (policy boilerplate) skip the
+        # network round-trip; per-instance cache, same pattern as the
+        # memoized ambiguity check
+        self._translate_cached = lru_cache(maxsize=512)(self._translate_uncached)
         
     def detect_language(self, text: str) -> str:
         """
         Detects if text is primarily Hindi or English.
         Uses Devanagari Unicode block heuristic (U+0900 to U+097F).
         """
-        # Count Devanagari characters
-        devanagari_chars = len(re.findall(r'[\u0900-\u097F]', text))
-        total_chars = len(text.strip())
-        
+        # len(text) directly: stripping allocated a copy of the whole
+        # buffer for a denominator the 10% heuristic barely notices
+        total_chars = len(text)
+
         if total_chars == 0:
             return "en"
+
+        # Count Devanagari characters without materializing a list of
+        # one-character match strings
+        devanagari_chars = sum(1 for _ in _DEVANAGARI_RE.finditer(text))
             
         # If > 10% characters are Devanagari, assume Hindi
         if (devanagari_chars / total_chars) > 0.1:
@@ -36,13 +49,20 @@ class MultilingualParser:
     def translate_to_english(self, text: str) -> str:
         """Translates Hindi text to English."""
         try:
-            # Deep Translator handles splitting automatically usually, but let's be safe
-            translated = self.translator.translate(text)
-            return translated
+            return self._translate_cached(text)
         except Exception as e:
+            # Failures are not cached, so the next call retries
             print(f"⚠️ Translation failed: {e}")
             return text  # Return original if failed
 
+    def _translate_uncached(self, text: str) -> str:
+        """Network translation call behind the per-instance LRU."""
+        if self.translator is None:
+            # Default is auto -> en
+            self.translator = GoogleTranslator(source='auto', target='en')
+        # Deep Translator handles splitting automatically usually, but let's be safe
+        return self.translator.translate(text)
+
     def parse_multilingual_policy(self, text: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Detects language, translates if needed, and extracts rules.
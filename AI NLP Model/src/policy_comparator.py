@@ -6,6 +6,41 @@ Detects conflicts, duplicates, and overlaps between policies using rule-based NL
 import re
 from typing import List, Dict, Set, Any, Tuple
 
+from .comparator_numba import NUMBA_AVAILABLE
+if NUMBA_AVAILABLE:
+    from .comparator_numba import jaccard_sorted, token_id_array
+
+# Tokenizer constants, built once at import instead of per _tokenize call
+
+# Split into alphanumeric chunks (handles "2L" -> "2", "L")
+_TOKEN_RE = re.compile(r'[a-z]+|\d+')
+
+# logical synonyms map
+_SYNONYMS = {
+    'award': 'provide',
+    'give': 'provide',
+    'disburse': 'provide',
+    'receive': 'provide',
+    'grant': 'provide',
+    'less': 'lt',
+    'below': 'lt',
+    'under': 'lt',
+    'lakh': 'l',
+    'lac': 'l',
+    'certificate': 'proof',
+    'document': 'proof'
+}
+
+# Basic stop words set
+_STOP_WORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'but', 'if', 'then', 'else',
+    'when', 'at', 'by', 'for', 'with', 'about', 'against', 'between',
+    'into', 'through', 'during', 'before', 'after', 'above',
+    'to', 'from', 'up', 'down', 'in', 'out', 'on', 'off', 'over',
+    'again', 'further', 'once', 'must', 'shall',
+    'will', 'can', 'may', 'should', 'of'
+})
+
 class PolicyComparator:
     """
     Compares policy rules to identify conflicts and overlaps.
@@ -23,7 +58,76 @@ class PolicyComparator:
     # Thresholds
     HIGH_SIMILARITY = 0.8
     MEDIUM_SIMILARITY = 0.45
-    
+
+    def __init__(self):
+        # Token -> int32 id for the Numba kernel; grows with the
+        # vocabulary and never needs resetting (ids only have to be
+        # consistent, not dense)
+        self._vocab: Dict[str, int] = {}
+
+    def _field_entry(self, text: str) -> tuple:
+        """Build one profile entry: (had_text, token_set, id_array)."""
+        return self._pack_entry(bool(text), self._tokenize(text))
+
+    def _conditions_entry(self, conditions: List[str]) -> tuple:
+        """
+        Profile entry for the conditions list: tokenize each condition
+        and union the sets directly, skipping the intermediate
+        " ".join(...) string and its re-tokenization.
+        """
+        tokens: Set[str] = set()
+        for cond in conditions:
+            tokens |= self._tokenize(cond)
+        # has_text must match bool(" ".join(conditions)) exactly: two or
+        # more elements always joined to a non-empty string (the
+        # separator), even when every element is empty
+        has_text = bool(conditions) and (len(conditions) > 1 or bool(conditions[0]))
+        return self._pack_entry(has_text, tokens)
+
+    def _pack_entry(self, has_text: bool, tokens: Set[str]) -> tuple:
+        """Attach the sorted id array used by the Numba kernel."""
+        if NUMBA_AVAILABLE:
+            vocab = self._vocab
+            ids = token_id_array(
+                vocab.setdefault(tok, len(vocab)) for tok in tokens
+            )
+        else:
+            ids = None
+        return (has_text, tokens, ids)
+
+    def _rule_profile(self, rule: Dict[str, Any],
+                      cache: Dict[int, tuple] = None) -> tuple:
+        """
+        Tokenize a rule's four compared fields into one profile tuple.
+        Each entry is (field_had_text, token_set, id_array), preserving
+        the empty-text semantics of _jaccard_similarity; id_array is the
+        sorted int32 form used by the optional Numba kernel.
+
+        cache, when given, is a per-run dict keyed by id(rule). It must
+        not outlive the rule dicts it indexes: CPython reuses the
+        addresses of freed objects, so a cache that persists across
+        calls could serve a stale profile for a different rule.
+        compare_policies owns one per run and keeps every rule alive for
+        its duration.
+        """
+        if cache is not None:
+            profile = cache.get(id(rule))
+            if profile is not None:
+                return profile
+        action = str(rule.get('action', '') or '')
+        conditions = rule.get('conditions', []) or []
+        beneficiary = str(rule.get('beneficiary', '') or '')
+        role = str(rule.get('responsible_role', '') or '')
+        profile = (
+            self._field_entry(action),
+            self._conditions_entry(conditions),
+            self._field_entry(beneficiary),
+            self._field_entry(role),
+        )
+        if cache is not None:
+            cache[id(rule)] = profile
+        return profile
+
     def compare_policies(self, new_policy: Dict[str, Any], existing_policies: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Compare a new policy against a list of existing policies.
@@ -40,86 +144,153 @@ class PolicyComparator:
             "conflicts": [],
             "recommendations": []
         }
-        
+
+        # Per-run profile cache: each rule is tokenized once instead of
+        # once per pair. Local on purpose — new_rules and existing_flat
+        # keep every rule dict alive for the whole run, so id(rule) keys
+        # are stable here, which would not hold across public calls
+        profiles: Dict[int, tuple] = {}
+
+        # Dedupe as we go: recommendations keep rule-encounter order and
+        # no final set/list rebuild pass is needed
+        seen_recommendations = set()
+
+        def recommend(message: str):
+            if message not in seen_recommendations:
+                seen_recommendations.add(message)
+                results["recommendations"].append(message)
+
         new_rules = new_policy.get('rules', [])
-        
+
+        # Inverted-index blocking: flatten the existing rules once and
+        # map every token (across all four compared fields) to the rules
+        # containing it. A pair sharing no token anywhere can only score
+        # through empty/stopword-only fields, which the fallback-weight
+        # check below catches, so skipping the rest is exact.
+        existing_flat = []
+        token_index: Dict[str, List[int]] = {}
+        for ex_policy in existing_policies:
+            for ex_rule in ex_policy.get('rules', []):
+                idx = len(existing_flat)
+                existing_flat.append((ex_policy, ex_rule))
+                rule_tokens = set()
+                for _has, tokens, _ids in self._rule_profile(ex_rule, profiles):
+                    rule_tokens |= tokens
+                for tok in rule_tokens:
+                    token_index.setdefault(tok, []).append(idx)
+
         for new_rule in new_rules:
-            for ex_policy in existing_policies:
-                ex_rules = ex_policy.get('rules', [])
-                for ex_rule in ex_rules:
+            new_profile = self._rule_profile(new_rule, profiles)
+
+            # Weight a pair could collect with zero shared tokens: only
+            # fields that are empty (or stopword-only) on the new side
+            # can score 1.0 against a matching-empty existing field
+            fallback_weight = sum(
+                weight
+                for (field, weight), (has, tokens, _ids) in zip(
+                    self.WEIGHTS.items(), new_profile)
+                if not has or not tokens
+            )
+
+            if fallback_weight > self.MEDIUM_SIMILARITY:
+                # Degenerate rule (mostly empty): blocking is unsafe,
+                # fall back to comparing against everything
+                candidate_ids = range(len(existing_flat))
+            else:
+                new_tokens = set()
+                for _has, tokens, _ids in new_profile:
+                    new_tokens |= tokens
+                seen_ids = set()
+                for tok in new_tokens:
+                    seen_ids.update(token_index.get(tok, ()))
+                # Sorted = original policy/rule encounter order
+                candidate_ids = sorted(seen_ids)
+
+            for idx in candidate_ids:
+                ex_policy, ex_rule = existing_flat[idx]
+
+                similarity, scores = self._similarity_with_scores(
+                    new_rule, ex_rule, prune_below=self.MEDIUM_SIMILARITY,
+                    cache=profiles
+                )
+
+                if similarity > self.MEDIUM_SIMILARITY:
+                    conflict_type, reason = self._determine_conflict_type(
+                        new_rule, ex_rule, similarity, scores
+                    )
                     
-                    similarity = self.calculate_rule_similarity(new_rule, ex_rule)
+                    conflict_entry = {
+                        "existing_policy_id": ex_policy.get('policy_id'),
+                        "existing_rule_id": ex_rule.get('rule_id'),
+                        "new_rule_id": new_rule.get('rule_id'),
+                        "conflict_type": conflict_type,
+                        "similarity_score": round(similarity, 2),
+                        "reason": reason
+                    }
+                    results["conflicts"].append(conflict_entry)
                     
-                    if similarity > self.MEDIUM_SIMILARITY:
-                        conflict_type, reason = self._determine_conflict_type(new_rule, ex_rule, similarity)
-                        
-                        conflict_entry = {
-                            "existing_policy_id": ex_policy.get('policy_id'),
-                            "existing_rule_id": ex_rule.get('rule_id'),
-                            "new_rule_id": new_rule.get('rule_id'),
-                            "conflict_type": conflict_type,
-                            "similarity_score": round(similarity, 2),
-                            "reason": reason
-                        }
-                        results["conflicts"].append(conflict_entry)
-                        
-                        # Generate recommendation
-                        if conflict_type == "duplicate":
-                            results["recommendations"].append(
-                                f"Rule {new_rule.get('rule_id')} is a duplicate of {ex_policy.get('policy_id')}/{ex_rule.get('rule_id')}. Consider removing."
-                            )
-                        elif conflict_type == "contradiction":
-                             results["recommendations"].append(
-                                f"Rule {new_rule.get('rule_id')} contradicts {ex_policy.get('policy_id')}/{ex_rule.get('rule_id')}. Please resolve the contradictory actions."
-                            )
-                        elif conflict_type == "overlap":
-                             results["recommendations"].append(
-                                f"Rule {new_rule.get('rule_id')} overlaps with {ex_policy.get('policy_id')}/{ex_rule.get('rule_id')}. Ensure beneficiary scope is distinct."
-                            )
-
-        # Deduplicate recommendations
-        results["recommendations"] = list(set(results["recommendations"]))
+                    # Generate recommendation
+                    if conflict_type == "duplicate":
+                        recommend(
+                            f"Rule {new_rule.get('rule_id')} is a duplicate of {ex_policy.get('policy_id')}/{ex_rule.get('rule_id')}. Consider removing."
+                        )
+                    elif conflict_type == "contradiction":
+                        recommend(
+                            f"Rule {new_rule.get('rule_id')} contradicts {ex_policy.get('policy_id')}/{ex_rule.get('rule_id')}. Please resolve the contradictory actions."
+                        )
+                    elif conflict_type == "overlap":
+                        recommend(
+                            f"Rule {new_rule.get('rule_id')} overlaps with {ex_policy.get('policy_id')}/{ex_rule.get('rule_id')}. Ensure beneficiary scope is distinct."
+                        )
+
         return results
 
     def calculate_rule_similarity(self, rule1: Dict[str, Any], rule2: Dict[str, Any]) -> float:
         """
         Calculate weighted similarity score between two rules (0.0 to 1.0).
         """
+        return self._similarity_with_scores(rule1, rule2)[0]
+
+    def _similarity_with_scores(self, rule1: Dict[str, Any], rule2: Dict[str, Any],
+                                prune_below: float = None,
+                                cache: Dict[int, tuple] = None) -> Tuple[float, Dict[str, float]]:
+        """
+        Weighted similarity plus the per-field score breakdown, so
+        callers that classify the conflict don't recompute field scores.
+
+        With prune_below set, scoring stops as soon as even perfect
+        scores on the remaining fields could not lift the pair over that
+        threshold; the returned (partial) score is then a lower bound
+        that is guaranteed to stay at or below prune_below.
+        """
+        profile1 = self._rule_profile(rule1, cache)
+        profile2 = self._rule_profile(rule2, cache)
+
+        # Field order matches _rule_profile: action, conditions,
+        # beneficiary, responsible_role
         scores = {}
-        
-        # 1. Action Similarity (Weight: 40%)
-        scores['action'] = self._jaccard_similarity(
-            str(rule1.get('action', '')), 
-            str(rule2.get('action', ''))
-        )
-        
-        # 2. Conditions Similarity (Weight: 30%)
-        # Join lists into single string for comparison
-        cond1 = " ".join(rule1.get('conditions', []) or [])
-        cond2 = " ".join(rule2.get('conditions', []) or [])
-        scores['conditions'] = self._jaccard_similarity(cond1, cond2)
-        
-        # 3. Beneficiary Similarity (Weight: 20%)
-        scores['beneficiary'] = self._jaccard_similarity(
-            str(rule1.get('beneficiary', '')), 
-            str(rule2.get('beneficiary', ''))
-        )
-        
-        # 4. Role Similarity (Weight: 10%)
-        scores['responsible_role'] = self._jaccard_similarity(
-            str(rule1.get('responsible_role', '')), 
-            str(rule2.get('responsible_role', ''))
-        )
-        
-        # Weighted Check
-        final_score = (
-            scores['action'] * self.WEIGHTS['action'] +
-            scores['conditions'] * self.WEIGHTS['conditions'] +
-            scores['beneficiary'] * self.WEIGHTS['beneficiary'] +
-            scores['responsible_role'] * self.WEIGHTS['responsible_role']
-        )
-        
-        return final_score
+        final_score = 0.0
+        remaining = 1.0
+        for (field, weight), (has1, tokens1, ids1), (has2, tokens2, ids2) in zip(
+                self.WEIGHTS.items(), profile1, profile2):
+            if ids1 is not None:
+                # Compiled two-pointer merge on the sorted id arrays;
+                # empty-text semantics are resolved here, outside the kernel
+                if not has1 and not has2:
+                    score = 1.0
+                elif not has1 or not has2:
+                    score = 0.0
+                else:
+                    score = jaccard_sorted(ids1, ids2)
+            else:
+                score = self._jaccard_sets(has1, tokens1, has2, tokens2)
+            scores[field] = score
+            final_score += score * weight
+            remaining -= weight
+            if prune_below is not None and final_score + remaining <= prune_below:
+                break
+
+        return final_score, scores
 
     def _jaccard_similarity(self, text1: str, text2: str) -> float:
         """Calculate Jaccard similarity between two strings."""
@@ -127,71 +298,51 @@ class PolicyComparator:
             return 1.0
         if not text1 or not text2:
             return 0.0
-            
+
         # Tokenize and clean
-        tokens1 = self._tokenize(text1)
-        tokens2 = self._tokenize(text2)
-        
+        return self._jaccard_sets(True, self._tokenize(text1), True, self._tokenize(text2))
+
+    def _jaccard_sets(self, has1: bool, tokens1: Set[str], has2: bool, tokens2: Set[str]) -> float:
+        """Jaccard similarity on pre-tokenized sets."""
+        if not has1 and not has2:
+            return 1.0
+        if not has1 or not has2:
+            return 0.0
+
         if not tokens1 and not tokens2:
             return 1.0
-            
-        intersection = tokens1.intersection(tokens2)
-        union = tokens1.union(tokens2)
-        
-        return len(intersection) / len(union)
+
+        # |A ∪ B| = |A| + |B| − |A ∩ B|: only the intersection set is
+        # ever materialized, the union never is
+        intersection = len(tokens1 & tokens2)
+        union = len(tokens1) + len(tokens2) - intersection
+
+        return intersection / union
 
     def _tokenize(self, text: str) -> Set[str]:
         """Convert text to set of cleaned tokens with basic normalization."""
-        text = text.lower()
-        
-        # Split into alphanumeric chunks (handles "2L" -> "2", "L")
-        # Keep only alphanumeric tokens
-        raw_tokens = re.findall(r'[a-z]+|\d+', text)
-        
-        # logical synonyms map
-        synonyms = {
-            'award': 'provide',
-            'give': 'provide',
-            'disburse': 'provide',
-            'receive': 'provide',
-            'grant': 'provide',
-            'less': 'lt',
-            'below': 'lt',
-            'under': 'lt',
-            'lakh': 'l',
-            'lac': 'l',
-            'certificate': 'proof',
-            'document': 'proof'
-        }
-        
-        tokens = set()
-        for word in raw_tokens:
-            # Apply synonym mapping
-            word = synonyms.get(word, word)
-            tokens.add(word)
-        
-        # Basic stop words set
-        stop_words = {
-            'a', 'an', 'the', 'and', 'or', 'but', 'if', 'then', 'else', 
-            'when', 'at', 'by', 'for', 'with', 'about', 'against', 'between',
-            'into', 'through', 'during', 'before', 'after', 'above', 
-            'to', 'from', 'up', 'down', 'in', 'out', 'on', 'off', 'over', 
-            'again', 'further', 'once', 'must', 'shall', 
-            'will', 'can', 'may', 'should', 'of'
-        }
-        
-        return tokens - stop_words
+        # Synonym mapping applied inside a single comprehension: the
+        # whole build runs on the SET_ADD fast path with no per-token
+        # bytecode between inserts
+        tokens = {_SYNONYMS.get(word, word) for word in _TOKEN_RE.findall(text.lower())}
+
+        return tokens - _STOP_WORDS
 
-    def _determine_conflict_type(self, rule1: Dict[str, Any], rule2: Dict[str, Any], similarity: float) -> Tuple[str, str]:
+    def _determine_conflict_type(self, rule1: Dict[str, Any], rule2: Dict[str, Any],
+                                 similarity: float, scores: Dict[str, float] = None) -> Tuple[str, str]:
         """Determine specific type of conflict based on similarity profile."""
-        
-        # Logic: 
+
+        # Logic:
         # - High Action Sim + High Beneficiary Sim = Duplicate
         # - High Beneficiary Sim + Low Action Sim = Contradiction (potentially) or different rules for same people
         # - High Action Sim + Low Conditions/Beneficiary = Overlap (same benefit, different people)
-        
-        action_sim = self._jaccard_similarity(str(rule1.get('action')), str(rule2.get('action')))
-        beneficiary_sim = self._jaccard_similarity(str(rule1.get('beneficiary')), str(rule2.get('beneficiary')))
+
+        # Reuse the field scores computed alongside the weighted
+        # similarity rather than re-tokenizing both rules
+        if scores is None:
+            scores = self._similarity_with_scores(rule1, rule2)[1]
+        action_sim = scores['action']
+        beneficiary_sim = scores['beneficiary']
         
         reason = ""
         conflict_type = "overlap"
@@ -2,8 +2,11 @@
 
 import ollama
 import json
+import logging
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from .document_chunker import DocumentChunker
 from .schema import PolicyRule, Policy, create_empty_rule
@@ -11,6 +14,36 @@ from .utils import clean_text, extract_sentences, generate_rule_id as utils_gene
 from datetime import datetime
 from .cache_manager import CacheManager
 
+# Per-chunk progress goes through the queued "policy_nlp" logger rather
+# than print: no stdout flush per chunk, thread-safe with the chunk
+# worker pool, and silenceable via level config
+logger = logging.getLogger("policy_nlp.parser")
+
+
+_VAGUE_ROLES = ("authority", "official", "concerned officer", "department")
+
+# One C-level scan instead of one substring pass per vague role.
+# Deliberately unanchored: 'officials' must keep matching 'official'.
+_VAGUE_ROLE_RE = re.compile('|'.join(
+    re.escape(r) for r in sorted(_VAGUE_ROLES, key=len, reverse=True)
+))
+
+
+@lru_cache(maxsize=4096)
+def _role_is_vague(role_lower: str) -> bool:
+    """Memoized vague-role heuristic: roles repeat heavily across rules."""
+    # Specific title usually longer than just "authority"
+    return len(role_lower) < 15 and _VAGUE_ROLE_RE.search(role_lower) is not None
+
+
+def _as_str(value) -> str:
+    """Coerce a field to str, skipping str() when it already is one (the
+    schema-conformant common case for LLM output). Falsy values map to
+    "" to match the old str(value or "") behaviour."""
+    if isinstance(value, str):
+        return value
+    return str(value) if value else ""
+
 
 class PolicyParser:
     """Parse policy documents and extract structured rules using Ollama"""
@@ -47,7 +80,9 @@ class PolicyParser:
             return self.extract_rules_from_large_policy(cleaned_text)
             
         if use_cache:
-            cached = self.cache.get(policy_text)
+            # Key on cleaned_text so the lookup matches the key
+            # _process_single_chunk stores under
+            cached = self.cache.get(cleaned_text)
             if cached:
                 return cached
                 
@@ -63,24 +98,27 @@ class PolicyParser:
         chunks = self.chunker.chunk_document(text)
         all_rules = []
         
-        print(f"🔄 Processing {len(chunks)} chunks...")
-        
-        for chunk in chunks:
-            print(f"   ▶ Processing Chunk {chunk['chunk_id']} ({len(chunk['content'])} chars)...")
+        logger.info("🔄 Processing %d chunks...", len(chunks))
+
+        def process_chunk(chunk):
+            # We skip cache for individual chunks to ensure freshness during debug context
+            # Direct call to ollama for the chunk to avoid full pipeline overhead/caching issues per chunk
+            logger.info("   ▶ Processing Chunk %d (%d chars)...", chunk.chunk_id, len(chunk.content))
             try:
-                # We skip cache for individual chunks to ensure freshness during debug context
-                # Pass chunk content to the existing processing logic
-                # We construct a wrapper to re-use _process_single_chunk but we need to handle the return format
-                
-                # Direct call to ollama for the chunk to avoid full pipeline overhead/caching issues per chunk
-                response_data = self._extract_via_ollama(chunk['content'])
+                response_data = self._extract_via_ollama(chunk.content)
                 chunk_rules = response_data.get('rules', [])
-                
-                print(f"     ✅ Extracted {len(chunk_rules)} rules")
-                all_rules.extend(chunk_rules)
-                
+                logger.info("     ✅ Chunk %d: extracted %d rules", chunk.chunk_id, len(chunk_rules))
+                return chunk_rules
             except Exception as e:
-                print(f"     ❌ Error processing chunk {chunk['chunk_id']}: {e}")
+                logger.warning("     ❌ Error processing chunk %d: %s", chunk.chunk_id, e)
+                return []
+
+        # Each chunk call blocks on Ollama I/O, so overlap them with a
+        # small thread pool. executor.map yields results in submission
+        # order, keeping the merged rule list in document order.
+        with ThreadPoolExecutor(max_workers=min(4, len(chunks))) as executor:
+            for chunk_rules in executor.map(process_chunk, chunks):
+                all_rules.extend(chunk_rules)
         
         # Post-processing: Deduplicate and ID generation
         # Deduplication could be complex, for now we assume chunks have distinct rules
@@ -201,10 +239,16 @@ Return ONLY valid JSON. No extra fields, metadata, or explanations."""
         try:
             return json.loads(content)
         except json.JSONDecodeError:
-            # Try to find JSON block if mixed with text
-            match = re.search(r'\{.*\}', content, re.DOTALL)
-            if match:
-                return json.loads(match.group(0))
+            # Try to find JSON block if mixed with text. raw_decode stops
+            # at the end of the first complete object, so trailing prose
+            # doesn't force the backtracking-heavy r'\{.*\}' scan.
+            start = content.find('{')
+            if start != -1:
+                try:
+                    obj, _ = json.JSONDecoder().raw_decode(content, start)
+                    return obj
+                except json.JSONDecodeError:
+                    pass
             raise ValueError("Could not parse JSON from response")
 
     def generate_rule_ids(self, num_rules: int) -> List[str]:
@@ -240,21 +284,18 @@ Return ONLY valid JSON. No extra fields, metadata, or explanations."""
             cleaned_rule = {
                 "rule_id": rule.get("rule_id", ""),
                 "conditions": rule.get("conditions", []),
-                "action": str(rule.get("action", "") or ""),
-                "responsible_role": str(rule.get("responsible_role", "") or ""),
-                "beneficiary": str(rule.get("beneficiary", "") or ""),
-                "deadline": str(rule.get("deadline", "") or ""),
+                "action": _as_str(rule.get("action")),
+                "responsible_role": _as_str(rule.get("responsible_role")),
+                "beneficiary": _as_str(rule.get("beneficiary")),
+                "deadline": _as_str(rule.get("deadline")),
                 "ambiguity_flag": bool(rule.get("ambiguity_flag", False)),
-                "ambiguity_reason": str(rule.get("ambiguity_reason", "") or "")
+                "ambiguity_reason": _as_str(rule.get("ambiguity_reason"))
             }
             
             # --- VALIDATION LOGIC ---
             
             # 1. Check for vague roles
-            role = cleaned_rule["responsible_role"].lower()
-            vague_roles = ["authority", "official", "concerned officer", "department"]
-            if any(vr in role for vr in vague_roles) and len(role) < 15: # heuristic
-                # specific title usually longer than just "authority"
+            if _role_is_vague(cleaned_rule["responsible_role"].lower()):
                 if not cleaned_rule["ambiguity_flag"]:
                      cleaned_rule["ambiguity_flag"] = True
                      cleaned_rule["ambiguity_reason"] = f"Vague responsible role: '{cleaned_rule['responsible_role']}'. Specific title needed."
@@ -273,12 +314,16 @@ Return ONLY valid JSON. No extra fields, metadata, or explanations."""
                      cleaned_rule["ambiguity_flag"] = True
                      cleaned_rule["ambiguity_reason"] = "Action is too complex/long (>150 chars). Consider splitting."
                      
-            # Standardize conditions
+            # Standardize conditions. The schema-conformant case — a
+            # list that is already all strings — is by far the most
+            # common, so check it first and reuse the list as-is
+            # instead of rebuilding it per rule.
             conditions = cleaned_rule["conditions"]
-            if isinstance(conditions, str):
+            if type(conditions) is list:
+                if not all(type(c) is str for c in conditions):
+                    cleaned_rule["conditions"] = [str(c) for c in conditions if c is not None]
+            elif isinstance(conditions, str):
                 cleaned_rule["conditions"] = [conditions]
-            elif isinstance(conditions, list):
-                cleaned_rule["conditions"] = [str(c) for c in conditions if c is not None]
             else:
                 cleaned_rule["conditions"] = []
                 
@@ -346,18 +391,24 @@ Return ONLY valid JSON. No extra fields, metadata, or explanations."""
         data["policy_id"] = policy_id
         data["policy_title"] = policy_title
         
-        # Convert to Policy objects
+        # Convert to Policy objects. Rules already passed through
+        # clean_extracted_rules, so PolicyRule.construct() skips
+        # pydantic's field-by-field validation (tens of µs per rule,
+        # which dominates conversion for large policies); the two
+        # invariants its validators enforced are checked inline.
         rules = []
         for r_data in data.get("rules", []):
             # Ensure rule_id is present and clean
-            rid = r_data.get("rule_id")
-            if not rid:
-                rid = "R_UNKNOWN"
-                
-            rule = PolicyRule(
+            rid = (r_data.get("rule_id") or "R_UNKNOWN").strip() or "R_UNKNOWN"
+
+            action = r_data.get("action", "").strip()
+            if not action:
+                raise ValueError('action cannot be empty')
+
+            rule = PolicyRule.construct(
                 rule_id=rid,
                 conditions=r_data.get("conditions", []),
-                action=r_data.get("action", ""),
+                action=action,
                 responsible_role=r_data.get("responsible_role", ""),
                 beneficiary=r_data.get("beneficiary", ""),
                 deadline=r_data.get("deadline", ""),
@@ -365,7 +416,10 @@ Return ONLY valid JSON. No extra fields, metadata, or explanations."""
                 ambiguity_reason=r_data.get("ambiguity_reason", "")
             )
             rules.append(rule)
-            
+
+        # Policy keeps its real constructor: id/title validation is two
+        # calls per document, and pydantic passes the PolicyRule
+        # instances through without re-validating them.
         return Policy(
             policy_id=policy_id,
             policy_title=policy_title,
@@ -1,171 +1,338 @@
 """
 Parallel Policy Parser for High-Speed Extraction.
-Uses ThreadPoolExecutor to process document chunks simultaneously.
+Uses asyncio + ollama.AsyncClient to process document chunks simultaneously.
 """
 
+import asyncio
+import hashlib
+import logging
 import ollama
 import json
+import os
 import re
+from collections import OrderedDict
 from typing import Dict, Any, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from .document_chunker import DocumentChunker
-from .schema import PolicyRule, Policy
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from .document_chunker import Chunk, DocumentChunker
+from .schema import InternalRule, PolicyRule, Policy
 from .utils import clean_text
 
+# Metadata extractors, compiled once at import instead of per document
+_UIN_RE = re.compile(r'UIN[:\s]*(\d+[A-Z]\d+[A-Z]\d+)')
+_TITLE_RE = re.compile(r"LIC's ([A-Za-z\s]+)")
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Child of the "policy_nlp" queue logger configured in main.py: progress
+# lines from concurrent chunk tasks are queued to a listener thread
+# instead of contending for stdout
+logger = logging.getLogger("policy_nlp.parallel")
+
+
+def _drain_array(buf: str, pos: int, out: List[Any]) -> "tuple[int, bool]":
+    """
+    Pull completed objects out of a streaming JSON array buffer.
+
+    pos points just past the array's '['. Each fully received object is
+    appended to out via raw_decode (C parser, no re-scan of consumed
+    input); returns the new position and whether the closing ']' has
+    arrived.
+    """
+    while True:
+        while pos < len(buf) and buf[pos] in ' \t\r\n,':
+            pos += 1
+        if pos >= len(buf):
+            return pos, False
+        if buf[pos] == ']':
+            return pos, True
+        try:
+            obj, end = _JSON_DECODER.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Object still incomplete — wait for more tokens
+            return pos, False
+        out.append(obj)
+        pos = end
+
 class ParallelPolicyParser:
     """Process huge policies in parallel for 3-4x speedup"""
-    
+
+    # Frozen instruction prefix, identical for every chunk. Sending it
+    # as the system message with only the chunk text in the user turn
+    # means the prompt's static head token-for-token repeats across
+    # calls, so the server's prompt cache can reuse the prefix prefill
+    # instead of recomputing ~300 tokens per chunk.
+    _PROMPT_PREFIX = """You are a Policy Intelligence Engine. Extract EXECUTABLE policy rules ONLY.
+
+STRICT RULES:
+1. Extract ONLY obligations, permissions, restrictions, or benefits
+2. IGNORE: definitions, annexures, headers, tables, contact details
+3. SPLIT compound actions into atomic rules (one action per rule)
+4. Use EXACT schema - no extra fields
+
+REQUIRED JSON SCHEMA:
+[{"rule_id":"TEMP","conditions":["trigger"],"action":"exact action","responsible_role":"LIC|Policyholder|Life Assured|Nominee|Claimant","beneficiary":"who benefits","deadline":"specific timeframe or empty","ambiguity_flag":false,"ambiguity_reason":""}]
+
+ROLE NORMALIZATION:
+- Corporation/Insurer/Company → "LIC"
+- Use ONLY: LIC, Policyholder, Life Assured, Nominee, Claimant
+
+MANDATORY AMBIGUITY FLAG:
+Set ambiguity_flag=true IF:
+- responsible_role is empty
+- deadline is empty when action requires timing
+- text has "may", "as applicable", "subject to", "in accordance with"
+- action cannot be system-executed
+
+Provide clear ambiguity_reason for every flagged rule.
+
+If no executable rules found: []
+
+Return ONLY valid JSON array, no text."""
+
     def __init__(self, model_name: str = "llama3.1:8b", max_workers: int = 4):
         """Initialize with optimized settings for speed"""
         self.model_name = model_name
         self.max_workers = max_workers
         self.chunker = DocumentChunker(max_chunk_size=8000)  # Larger chunks = fewer API calls
+
+        # Ask the server to co-batch our burst of chunk requests into
+        # shared forward passes. Only effective if the Ollama server
+        # inherits this environment (e.g. spawned from here); otherwise
+        # set OLLAMA_NUM_PARALLEL on the server to match max_workers.
+        os.environ.setdefault('OLLAMA_NUM_PARALLEL', str(max_workers))
         
+        # Chunk results keyed by content hash: boilerplate chunks
+        # repeated across documents and re-runs skip the LLM call
+        self._chunk_cache: OrderedDict = OrderedDict()
+        self._chunk_cache_max = 4096
+
         # Section keywords to skip (non-rule content)
         self.skip_sections = [
             'annexure', 'annexe', 'disclaimer', 'notes:', 'definitions',
             'table of contents', 'index', 'grievance', 'contact details'
         ]
+        # Single compiled scan of the chunk head instead of one
+        # substring pass per keyword
+        self._skip_re = re.compile('|'.join(re.escape(s) for s in self.skip_sections))
+
+        # Positive signals an executable rule would carry (modals,
+        # deadlines, benefit verbs). Chunks with none of these cannot
+        # yield rules and are dropped before an LLM call is spent on
+        # them. Substring matching on purpose: a false hit only means
+        # the chunk is processed, never that rules are lost.
+        self.signal_words = [
+            'shall', 'must', 'may', 'will', 'should', 'entitled',
+            'eligible', 'within', 'pay', 'refund', 'deduct', 'cancel',
+            'revive', 'provide', 'grant', 'issue', 'notify', 'inform',
+            'submit', 'claim', 'benefit'
+        ]
+        self._signal_re = re.compile('|'.join(re.escape(s) for s in self.signal_words))
 
     def extract_rules_parallel(self, policy_text: str) -> Dict[str, Any]:
         """
         Main entry point for parallel extraction
         """
-        print(f"⚡ PARALLEL MODE: Processing using {self.max_workers} threads", flush=True)
-        
-        # Step 1: Chunk document
+        logger.info("⚡ PARALLEL MODE: Processing using %d threads", self.max_workers)
+
         cleaned_text = clean_text(policy_text)
-        chunks = self.chunker.chunk_document(cleaned_text)
-        
-        print(f"📊 Split into {len(chunks)} chunks", flush=True)
-        
-        # Pre-filter: Skip chunks unlikely to contain rules
-        filtered_chunks = []
-        skipped_count = 0
-        for chunk in chunks:
-            content_lower = chunk['content'][:500].lower()
-            if any(skip_word in content_lower for skip_word in self.skip_sections):
-                skipped_count += 1
-                continue
-            filtered_chunks.append(chunk)
-        
-        if skipped_count > 0:
-            print(f"⚡ Skipped {skipped_count} non-rule chunks (Annexures/Disclaimers)", flush=True)
-        
-        # Step 2: Process chunks in parallel
-        all_rules = []
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit filtered chunks
-            future_to_chunk = {
-                executor.submit(self._process_chunk_fast, chunk, i): (chunk, i) 
-                for i, chunk in enumerate(filtered_chunks, 1)
-            }
-            
-            # Collect results
-            for future in as_completed(future_to_chunk):
-                chunk, chunk_num = future_to_chunk[future]
-                try:
-                    rules = future.result()
-                    all_rules.extend(rules)
-                    print(f"   ✅ Chunk {chunk_num}/{len(chunks)}: {len(rules)} rules", flush=True)
-                except Exception as e:
-                    print(f"   ❌ Chunk {chunk_num} failed: {e}", flush=True)
-        
-        # Sort rules by ID (attempt to keep order based on chunk_num)
+
+        # Chunking streams: one LLM task is created per chunk the moment
+        # the chunker yields it, so early chunks are in flight while the
+        # tail of a huge document is still being segmented. The work is
+        # HTTP round trips to the Ollama server, so async coroutines
+        # overlap the requests without tying a thread up per chunk.
+        all_rules, total_chunks = asyncio.run(self._stream_chunk_rules(cleaned_text))
+
+        # gather preserves submission order, so rules arrive in document order
         # Re-assign IDs sequentially to keep them clean
         for i, rule in enumerate(all_rules):
             rule['rule_id'] = f"R{i+1}"
-        
+
         # Extract metadata
         metadata = self._extract_metadata_fast(cleaned_text[:5000])
-        
+
         return {
             "policy_id": metadata['policy_id'],
             "policy_title": metadata['policy_title'],
             "rules": all_rules,
             "metadata": {
                 "method": "parallel_extraction",
-                "chunks": len(chunks),
+                "chunks": total_chunks,
                 "total_rules": len(all_rules)
             }
         }
 
 
-    def _process_chunk_fast(self, chunk: Dict[str, Any], chunk_num: int) -> List[Dict[str, Any]]:
+    async def _stream_chunk_rules(self, cleaned_text: str) -> "tuple[List[Dict[str, Any]], int]":
         """
-        Production-grade chunk processing with strict quality enforcement
+        Create one LLM task per chunk as the chunker yields it, then
+        merge the results in document order.
+
+        A semaphore caps in-flight requests at max_workers so we respect
+        the server's OLLAMA_NUM_PARALLEL slot count (raise both together
+        to scale further). The sleep(0) after each task creation hands
+        the event loop to already-created tasks, letting their requests
+        go out while later chunks are still being cut and filtered.
         """
-        prompt = f"""You are a Policy Intelligence Engine. Extract EXECUTABLE policy rules ONLY.
+        client = ollama.AsyncClient()
+        semaphore = asyncio.Semaphore(self.max_workers)
 
-TEXT:
-{chunk['content'][:8000]}
+        tasks: List[asyncio.Task] = []
+        total_chunks = 0
+        skipped_count = 0
+        skipped_no_signal = 0
+        for chunk in self.chunker.iter_chunks(cleaned_text):
+            total_chunks += 1
+            content_lower = chunk.content.lower()
+            if self._skip_re.search(content_lower[:500]):
+                skipped_count += 1
+                continue
+            if self._signal_re.search(content_lower) is None:
+                skipped_no_signal += 1
+                continue
+            tasks.append(asyncio.create_task(
+                self._process_chunk_fast(client, semaphore, chunk, len(tasks) + 1)))
+            await asyncio.sleep(0)
 
-STRICT RULES:
-1. Extract ONLY obligations, permissions, restrictions, or benefits
-2. IGNORE: definitions, annexures, headers, tables, contact details
-3. SPLIT compound actions into atomic rules (one action per rule)
-4. Use EXACT schema - no extra fields
+        logger.info("📊 Split into %d chunks", total_chunks)
+        if skipped_count > 0:
+            logger.info("⚡ Skipped %d non-rule chunks (Annexures/Disclaimers)", skipped_count)
+        if skipped_no_signal > 0:
+            logger.info("⚡ Skipped %d chunks with no rule signals", skipped_no_signal)
 
-REQUIRED JSON SCHEMA:
-[{{"rule_id":"TEMP","conditions":["trigger"],"action":"exact action","responsible_role":"LIC|Policyholder|Life Assured|Nominee|Claimant","beneficiary":"who benefits","deadline":"specific timeframe or empty","ambiguity_flag":false,"ambiguity_reason":""}}]
+        gathered = await asyncio.gather(*tasks, return_exceptions=True)
 
-ROLE NORMALIZATION:
-- Corporation/Insurer/Company → "LIC"
-- Use ONLY: LIC, Policyholder, Life Assured, Nominee, Claimant
+        all_rules = []
+        for chunk_num, result in enumerate(gathered, 1):
+            if isinstance(result, BaseException):
+                logger.warning("   ❌ Chunk %d failed: %s", chunk_num, result)
+            else:
+                all_rules.extend(result)
+                logger.info("   ✅ Chunk %d/%d: %d rules", chunk_num, total_chunks, len(result))
+        return all_rules, total_chunks
 
-MANDATORY AMBIGUITY FLAG:
-Set ambiguity_flag=true IF:
-- responsible_role is empty
-- deadline is empty when action requires timing
-- text has "may", "as applicable", "subject to", "in accordance with"
-- action cannot be system-executed
+    async def _process_chunk_fast(self, client: "ollama.AsyncClient",
+                                  semaphore: asyncio.Semaphore,
+                                  chunk: Chunk, chunk_num: int) -> List[Dict[str, Any]]:
+        """
+        Production-grade chunk processing with strict quality enforcement
+        """
+        cache_key = hashlib.blake2b(chunk.content.encode(), digest_size=16).hexdigest()
+        cached = self._chunk_cache.get(cache_key)
+        if cached is not None:
+            self._chunk_cache.move_to_end(cache_key)
+            # Materialize fresh dicts on hit: callers mutate rule dicts
+            # (ID reassignment, validation repairs) and must not corrupt
+            # the cached records. Conditions lists are cloned too, since
+            # to_dict() hands back the record's own list.
+            hits = []
+            for rec in cached:
+                rule = rec.to_dict()
+                rule['conditions'] = list(rec.conditions)
+                hits.append(rule)
+            return hits
 
-Provide clear ambiguity_reason for every flagged rule.
+        # Size the context window and output budget to this chunk
+        # instead of paying the worst case on every call: small chunks
+        # allocate a smaller KV cache (more co-batched requests fit) and
+        # stop decoding sooner. ~4 chars per token plus the fixed prompt
+        # template; num_ctx rounded up to a 256-token boundary.
+        prompt_tokens = min(len(chunk.content), 8000) // 4 + 300
+        num_ctx = min(4096, max(1024, (prompt_tokens + 800 + 255) // 256 * 256))
+        num_predict = min(800, max(200, prompt_tokens // 3))
 
-If no executable rules found: []
+        try:
+            # OPTIMIZED: Faster parameters. Streaming lets the
+            # bracket-level parser below consume objects while the model
+            # is still decoding, instead of buffering the full reply
+            # first.
+            rules: List[Any] = []
+            buf = ''
+            pos = None  # position just past the array's '[' once seen
+            complete = False
+            async with semaphore:
+                stream = await client.chat(
+                    model=self.model_name,
+                    messages=[
+                        {'role': 'system', 'content': self._PROMPT_PREFIX},
+                        {'role': 'user', 'content': f"TEXT:\n{chunk.content[:8000]}"}
+                    ],
+                    stream=True,
+                    options={
+                        'temperature': 0,  # Deterministic for consistency
+                        'num_predict': num_predict,  # Scaled to chunk size
+                        'num_ctx': num_ctx,  # Smaller context = faster processing
+                        'top_p': 0.9,  # Focus on most likely tokens
+                        'repeat_penalty': 1.1  # Avoid repetition
+                    }
+                )
+                async for part in stream:
+                    piece = part['message']['content']
+                    if not piece:
+                        continue
+                    buf += piece
+                    if pos is None:
+                        start = buf.find('[')
+                        if start == -1:
+                            continue
+                        pos = start + 1
+                    # Only attempt a parse when this piece could have
+                    # completed an object or closed the array
+                    if '}' in piece or ']' in piece:
+                        pos, complete = _drain_array(buf, pos, rules)
+                        if complete:
+                            break
 
-Return ONLY valid JSON array, no text."""
+            if not rules and not complete:
+                # Non-array or prose-wrapped output: fall back to the
+                # whole-buffer cleanup path
+                cleaned_json = self._clean_json_output(buf.strip())
+                try:
+                    # orjson decodes large rule arrays several times
+                    # faster than stdlib json
+                    if orjson is not None:
+                        rules = orjson.loads(cleaned_json)
+                    else:
+                        rules = json.loads(cleaned_json)
+                except ValueError:
+                    # Silent fail for speed, empty rules returned
+                    return []
 
-        try:
-            # OPTIMIZED: Faster parameters
-            response = ollama.chat(
-                model=self.model_name,
-                messages=[{'role': 'user', 'content': prompt}],
-                options={
-                    'temperature': 0,  # Deterministic for consistency
-                    'num_predict': 800,  # Reduced: forces concise output
-                    'num_ctx': 4096,  # Smaller context = faster processing
-                    'top_p': 0.9,  # Focus on most likely tokens
-                    'repeat_penalty': 1.1  # Avoid repetition
-                }
-            )
-            
-            content = response['message']['content'].strip()
-            # Removed verbose logging for speed
-            
-            cleaned_json = self._clean_json_output(content)
-            
-            try:
-                rules = json.loads(cleaned_json)
-            except json.JSONDecodeError:
-                # Silent fail for speed, empty rules returned
-                return []
-            
             # Add temp IDs
             if isinstance(rules, list):
                 for i, rule in enumerate(rules):
                     rule['rule_id'] = f"TEMP_{chunk_num}_{i}"
                     rule['ambiguity_flag'] = False
                     rule['ambiguity_reason'] = ""
+                # Only successful parses are cached, so transient LLM or
+                # JSON failures are retried on the next encounter.
+                # Stored as slotted InternalRule records: at up to 4096
+                # entries the cache dominates the parser's resident
+                # memory, and dropping the per-dict hash tables roughly
+                # halves it. from_dict keeps a reference to the incoming
+                # conditions list, so clone before converting.
+                self._chunk_cache[cache_key] = [
+                    InternalRule.from_dict(rule) for rule in self._clone_rules(rules)
+                ]
+                while len(self._chunk_cache) > self._chunk_cache_max:
+                    self._chunk_cache.popitem(last=False)
                 return rules
             else:
                  return []
-        
+
         except Exception:
             # Silent fail for speed
             return []
 
+    @staticmethod
+    def _clone_rules(rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Cheap per-rule clone (rules are flat dicts of str/list[str])."""
+        return [dict(rule, conditions=list(rule.get('conditions', []))) for rule in rules]
+
     def _clean_json_output(self, text: str) -> str:
         """
         Robustly extracts JSON array from text
@@ -190,8 +357,8 @@ Return ONLY valid JSON array, no text."""
 
     def _extract_metadata_fast(self, text: str) -> Dict[str, str]:
         """Quick metadata extraction using regex"""
-        uin_match = re.search(r'UIN[:\s]*(\d+[A-Z]\d+[A-Z]\d+)', text)
-        title_match = re.search(r"LIC's ([A-Za-z\s]+)", text)
+        uin_match = _UIN_RE.search(text)
+        title_match = _TITLE_RE.search(text)
         
         return {
             "policy_id": uin_match.group(1) if uin_match else "UNKNOWN_ID",
@@ -10,9 +10,46 @@ Post-processes extracted policy rules to ensure:
 - Backend executability
 """
 
+import hashlib
+import logging
 import re
-from typing import Dict, List, Any
-from copy import deepcopy
+from typing import Dict, List, Any, Optional
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Child of the "policy_nlp" queue logger configured in main.py: records
+# are handed to a background listener thread instead of blocking on
+# console I/O
+logger = logging.getLogger("policy_nlp.validator")
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# Compound-action splitter, compiled once at import: _split_compound_actions
+# runs it per rule and re.compile inside the loop costs a cache lookup each time
+_OR_SPLIT_RE = re.compile(r'\s+or\s+', re.IGNORECASE)
+
+# Word tokenizer for exact-word keyword membership
+_WORD_RE = re.compile(r"[a-z']+")
+
+# Generic deadlines dropped by _validate_deadline_inplace
+_VAGUE_DEADLINES = frozenset({'as soon as possible', 'asap', 'immediately', 'promptly'})
+
+# Heading-like conditions dropped by _normalize_conditions_inplace
+_HEADING_CONDITIONS = frozenset({'death benefit', 'maturity benefit', 'surrender'})
+
+# Compound-role fallback ("LIC Claims Department" → LIC), one scan
+_LIC_RE = re.compile(r'lic|corporation|insurer')
 
 
 class PolicyRuleValidator:
@@ -35,6 +72,11 @@ class PolicyRuleValidator:
         
         # Valid normalized roles
         self.valid_roles = {'LIC', 'Policyholder', 'Life Assured', 'Nominee', 'Claimant'}
+
+        # Folded lookup: aliases plus lowercased canonical roles, so
+        # _normalize_roles resolves each role with a single dict get
+        self._role_lut = {**self.role_mapping,
+                          **{role.lower(): role for role in self.valid_roles}}
         
         # Keywords indicating non-rules (definitions, references)
         self.invalid_keywords = [
@@ -50,7 +92,92 @@ class PolicyRuleValidator:
             'in accordance with', 'reasonable', 'appropriate',
             'shall be determined', 'at discretion'
         ]
-    
+
+        # Verbs that mark an action as concrete/executable
+        self.action_verbs = [
+            'pay', 'refund', 'deduct', 'cancel', 'revive', 'allow',
+            'provide', 'grant', 'issue', 'inform', 'notify', 'submit'
+        ]
+
+        # Words whose presence in an action implies a deadline is needed
+        self.deadline_words = [
+            'within', 'pay', 'refund', 'notify', 'inform', 'submit', 'process'
+        ]
+
+        # Standalone keywords match as whole tokens (hash lookup, and no
+        # 'may'-inside-'maybe' false positives); multi-word phrases keep
+        # the substring scanners. Verbs stay substring on purpose — the
+        # scan is meant to catch inflections like 'pays'/'repay'.
+        self._invalid_words = frozenset(k for k in self.invalid_keywords if ' ' not in k)
+        self._trigger_words = frozenset(t for t in self.ambiguity_triggers if ' ' not in t)
+        invalid_phrases = [k for k in self.invalid_keywords if ' ' in k]
+        trigger_phrases = [t for t in self.ambiguity_triggers if ' ' in t]
+
+        # One-pass multi-pattern scanners for the per-rule phrase
+        # checks: an Aho-Corasick automaton when available, otherwise a
+        # compiled alternation (longest-first so longer phrases win)
+        self._invalid_automaton = self._build_automaton(invalid_phrases)
+        self._verb_automaton = self._build_automaton(self.action_verbs)
+        self._trigger_automaton = self._build_automaton(trigger_phrases)
+        self._deadline_automaton = self._build_automaton(self.deadline_words)
+
+        self._invalid_re = self._build_alternation(invalid_phrases)
+        self._verb_re = self._build_alternation(self.action_verbs)
+        self._trigger_re = self._build_alternation(trigger_phrases)
+        self._deadline_re = self._build_alternation(self.deadline_words)
+
+        # Patterns for the vectorized filter: word-bounded alternation
+        # for standalone keywords plus plain alternation for phrases,
+        # evaluated by pandas' C-level .str.contains
+        words_alt = '|'.join(re.escape(w) for w in sorted(self._invalid_words, key=len, reverse=True))
+        phrase_alt = '|'.join(re.escape(p) for p in sorted(invalid_phrases, key=len, reverse=True))
+        self._invalid_pat = rf"\b(?:{words_alt})\b|{phrase_alt}"
+        self._verb_pat = '|'.join(re.escape(v) for v in self.action_verbs)
+
+        # Same treatment for the ambiguity-flag pass: deadline words
+        # stay unanchored (matching the substring scanner), trigger
+        # words get \b anchors to mirror the token-membership check
+        self._deadline_pat = '|'.join(
+            re.escape(w) for w in sorted(self.deadline_words, key=len, reverse=True)
+        )
+        t_words_alt = '|'.join(re.escape(w) for w in sorted(self._trigger_words, key=len, reverse=True))
+        t_phrase_alt = '|'.join(re.escape(p) for p in sorted(trigger_phrases, key=len, reverse=True))
+        self._trigger_pat = rf"\b(?:{t_words_alt})\b|{t_phrase_alt}"
+
+    @staticmethod
+    def _build_automaton(phrases: List[str]) -> Optional["ahocorasick.Automaton"]:
+        """Build an Aho-Corasick automaton, or None without the library."""
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for phrase in phrases:
+            automaton.add_word(phrase, phrase)
+        automaton.make_automaton()
+        return automaton
+
+    @staticmethod
+    def _build_alternation(phrases: List[str]) -> "re.Pattern":
+        """Fallback single-pass scanner: escaped alternation, longest first."""
+        ordered = sorted(phrases, key=len, reverse=True)
+        return re.compile('|'.join(re.escape(p) for p in ordered))
+
+    def _contains_any(self, automaton, pattern, text: str) -> bool:
+        """True if any of the scanner's phrases occurs in text."""
+        if automaton is not None:
+            return next(automaton.iter(text), None) is not None
+        return pattern.search(text) is not None
+
+    def _first_trigger(self, text: str) -> Optional[str]:
+        """An ambiguity trigger present in text, or None."""
+        word_hits = frozenset(_WORD_RE.findall(text)) & self._trigger_words
+        if word_hits:
+            return min(word_hits)
+        if self._trigger_automaton is not None:
+            match = next(self._trigger_automaton.iter(text), None)
+            return match[1] if match is not None else None
+        match = self._trigger_re.search(text)
+        return match.group(0) if match is not None else None
+
     def validate_and_repair(self, policy_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Main validation and repair pipeline
@@ -65,36 +192,41 @@ class PolicyRuleValidator:
         7. Remove duplicates
         8. Final executability check
         """
-        repaired = deepcopy(policy_data)
-        
+        # Rules are flat dicts of strings plus a list of strings, so a
+        # shallow per-rule clone gives the same isolation as deepcopy at
+        # a fraction of the cost
+        repaired = {
+            **policy_data,
+            'rules': [
+                dict(rule, conditions=list(rule.get('conditions', [])))
+                for rule in policy_data.get('rules', [])
+            ],
+            'metadata': dict(policy_data.get('metadata', {})),
+        }
+
         rules = repaired.get('rules', [])
         
-        print(f"\n🔍 VALIDATION PIPELINE")
-        print(f"   Initial rules: {len(rules)}")
-        
+        logger.info("🔍 VALIDATION PIPELINE")
+        logger.info("   Initial rules: %d", len(rules))
+
         # Step 1: Filter invalid rules
         rules = self._filter_invalid_rules(rules)
-        print(f"   After filtering: {len(rules)}")
-        
+        logger.info("   After filtering: %d", len(rules))
+
         # Step 2: Split compound actions
         rules = self._split_compound_actions(rules)
-        print(f"   After atomicity split: {len(rules)}")
-        
-        # Step 3: Normalize roles
-        rules = self._normalize_roles(rules)
-        
-        # Step 4: Normalize conditions
-        rules = self._normalize_conditions(rules)
-        
-        # Step 5: Validate deadlines
-        rules = self._validate_deadlines(rules)
+        logger.info("   After atomicity split: %d", len(rules))
         
+        # Steps 3-5: Normalize roles, normalize conditions, validate
+        # deadlines — fused into a single traversal
+        rules = self._repair_rules(rules)
+
         # Step 6: Enforce ambiguity flags
         rules = self._enforce_ambiguity_flags(rules)
         
         # Step 7: Remove duplicates
         rules = self._remove_duplicates(rules)
-        print(f"   After deduplication: {len(rules)}")
+        logger.info("   After deduplication: %d", len(rules))
         
         # Step 8: Reassign rule IDs
         for idx, rule in enumerate(rules):
@@ -107,27 +239,58 @@ class PolicyRuleValidator:
             repaired['metadata']['total_rules'] = len(rules)
             repaired['metadata']['validated'] = True
         
-        print(f"   ✅ Final validated rules: {len(rules)}\n")
+        logger.info("   ✅ Final validated rules: %d", len(rules))
         
         return repaired
     
     def _filter_invalid_rules(self, rules: List[Dict]) -> List[Dict]:
         """Remove rules that are actually definitions, headers, or references"""
+        if pd is not None and rules:
+            return self._filter_invalid_rules_vec(rules)
+        return self._filter_invalid_rules_scalar(rules)
+
+    def _filter_invalid_rules_vec(self, rules: List[Dict]) -> List[Dict]:
+        """Vectorized filter: both keyword masks run as C-level scans.
+
+        Word-bounded regex stands in for the scalar path's token-set
+        membership; the two only diverge on words glued to digits
+        ('table3'), which the tokenizer splits and \\b does not.
+        """
+        actions = pd.Series([rule.get('action', '') for rule in rules]).str.lower()
+        conditions = pd.Series(
+            [' '.join(rule.get('conditions', [])) for rule in rules]
+        ).str.lower()
+
+        is_invalid = (
+            actions.str.contains(self._invalid_pat, regex=True)
+            | conditions.str.contains(self._invalid_pat, regex=True)
+        )
+        has_verb = actions.str.contains(self._verb_pat, regex=True)
+        keep = (~is_invalid) & has_verb
+
+        return [rule for rule, kept in zip(rules, keep.tolist()) if kept]
+
+    def _filter_invalid_rules_scalar(self, rules: List[Dict]) -> List[Dict]:
+        """Per-rule fallback used when pandas is unavailable."""
         valid_rules = []
-        
+
         for rule in rules:
             action = rule.get('action', '').lower()
             conditions = ' '.join(rule.get('conditions', [])).lower()
             
-            # Check if action or conditions contain invalid keywords
-            is_invalid = any(keyword in action or keyword in conditions 
-                           for keyword in self.invalid_keywords)
-            
+            # Check if action or conditions contain invalid keywords:
+            # whole-token membership for single words, one phrase scan
+            # for the rest. Fields are scanned separately so no phrase
+            # can straddle a join boundary.
+            tokens = frozenset(_WORD_RE.findall(action))
+            tokens |= frozenset(_WORD_RE.findall(conditions))
+            is_invalid = bool(tokens & self._invalid_words) or (
+                self._contains_any(self._invalid_automaton, self._invalid_re, action)
+                or self._contains_any(self._invalid_automaton, self._invalid_re, conditions)
+            )
+
             # Check if action is too vague (no verb)
-            has_action_verb = any(verb in action for verb in [
-                'pay', 'refund', 'deduct', 'cancel', 'revive', 'allow',
-                'provide', 'grant', 'issue', 'inform', 'notify', 'submit'
-            ])
+            has_action_verb = self._contains_any(self._verb_automaton, self._verb_re, action)
             
             if not is_invalid and has_action_verb:
                 valid_rules.append(rule)
@@ -144,11 +307,12 @@ class PolicyRuleValidator:
             # Check for OR clauses
             if ' or ' in action.lower() and 'and/or' not in action.lower():
                 # Split on "or"
-                parts = re.split(r'\s+or\s+', action, flags=re.IGNORECASE)
+                parts = _OR_SPLIT_RE.split(action)
                 if len(parts) == 2:
-                    # Create two atomic rules
+                    # Create two atomic rules (shallow clone; see
+                    # validate_and_repair for why this is safe)
                     for part in parts:
-                        new_rule = deepcopy(rule)
+                        new_rule = dict(rule, conditions=list(rule.get('conditions', [])))
                         new_rule['action'] = part.strip()
                         atomic_rules.append(new_rule)
                     continue
@@ -158,63 +322,116 @@ class PolicyRuleValidator:
         
         return atomic_rules
     
-    def _normalize_roles(self, rules: List[Dict]) -> List[Dict]:
-        """Normalize all responsible_role values"""
+    def _repair_rules(self, rules: List[Dict]) -> List[Dict]:
+        """Fused repair pass: role normalization, condition cleanup and
+        deadline validation are all per-rule in-place fixes, so they
+        share one traversal of the rules list instead of three (same
+        work, a third of the list walks)."""
         for rule in rules:
-            role = rule.get('responsible_role', '').strip()
-            role_lower = role.lower()
-            
-            # Map to normalized role
-            if role_lower in self.role_mapping:
-                rule['responsible_role'] = self.role_mapping[role_lower]
-            elif role and role not in self.valid_roles:
-                # Try partial matching for compound roles like "LIC Claims Department"
-                if 'lic' in role_lower or 'corporation' in role_lower or 'insurer' in role_lower:
-                    rule['responsible_role'] = 'LIC'
-                else:
-                    # Keep as is but will be flagged as ambiguous later
-                    pass
-        
+            self._normalize_role_inplace(rule)
+            self._normalize_conditions_inplace(rule)
+            self._validate_deadline_inplace(rule)
         return rules
-    
-    def _normalize_conditions(self, rules: List[Dict]) -> List[Dict]:
+
+    def _normalize_role_inplace(self, rule: Dict) -> None:
+        """Normalize the responsible_role value"""
+        role = rule.get('responsible_role', '').strip()
+        role_lower = role.lower()
+
+        # Single lookup covers aliases and already-valid roles
+        mapped = self._role_lut.get(role_lower)
+        if mapped is not None:
+            rule['responsible_role'] = mapped
+        elif role and role not in self.valid_roles:
+            # Try partial matching for compound roles like "LIC Claims Department"
+            if _LIC_RE.search(role_lower):
+                rule['responsible_role'] = 'LIC'
+            # Otherwise keep as is; flagged as ambiguous later
+
+    def _normalize_conditions_inplace(self, rule: Dict) -> None:
         """Normalize condition statements"""
-        for rule in rules:
-            conditions = rule.get('conditions', [])
-            normalized = []
-            
-            for cond in conditions:
-                # Remove heading-like conditions
-                if cond.lower().strip() in ['death benefit', 'maturity benefit', 'surrender']:
-                    continue
-                
-                # Keep event-based or eligibility conditions
-                if cond.strip():
-                    normalized.append(cond.strip())
-            
-            rule['conditions'] = normalized
-        
-        return rules
-    
-    def _validate_deadlines(self, rules: List[Dict]) -> List[Dict]:
-        """Validate and clean deadline fields"""
-        for rule in rules:
-            deadline = rule.get('deadline', '').strip()
-            
-            # Remove generic/vague deadlines
-            vague_deadlines = ['as soon as possible', 'asap', 'immediately', 'promptly']
-            if deadline.lower() in vague_deadlines:
-                rule['deadline'] = ''
-            
-            # Validate event-based deadlines are clear
-            if deadline and 'as per' in deadline.lower():
-                # Too vague, remove
-                rule['deadline'] = ''
-        
-        return rules
+        normalized = []
+        for cond in rule.get('conditions', []):
+            # Remove heading-like conditions
+            if cond.lower().strip() in _HEADING_CONDITIONS:
+                continue
+
+            # Keep event-based or eligibility conditions
+            if cond.strip():
+                normalized.append(cond.strip())
+
+        rule['conditions'] = normalized
+
+    def _validate_deadline_inplace(self, rule: Dict) -> None:
+        """Validate and clean the deadline field"""
+        deadline = rule.get('deadline', '').strip()
+
+        # Remove generic/vague deadlines
+        if deadline.lower() in _VAGUE_DEADLINES:
+            rule['deadline'] = ''
+
+        # Validate event-based deadlines are clear
+        if deadline and 'as per' in deadline.lower():
+            # Too vague, remove
+            rule['deadline'] = ''
     
     def _enforce_ambiguity_flags(self, rules: List[Dict]) -> List[Dict]:
         """Enforce mandatory ambiguity detection"""
+        if pd is not None and rules:
+            return self._enforce_ambiguity_flags_vec(rules)
+        return self._enforce_ambiguity_flags_scalar(rules)
+
+    def _enforce_ambiguity_flags_vec(self, rules: List[Dict]) -> List[Dict]:
+        """Columnar variant: rule fields are laid out as parallel Series
+        once, the three flag conditions run as C-level vector scans, and
+        reason strings are assembled only for the flagged rows.
+
+        Like the vectorized filter, \\b-anchored trigger words diverge
+        from the scalar tokenizer only on words glued to digits.
+        """
+        roles = pd.Series([rule.get('responsible_role', '') for rule in rules])
+        actions = pd.Series([rule.get('action', '') for rule in rules]).str.lower()
+        deadlines = pd.Series([rule.get('deadline', '') for rule in rules]).str.strip()
+        full = actions + ' ' + pd.Series(
+            [' '.join(rule.get('conditions', [])) for rule in rules]
+        ).str.lower()
+
+        missing_role = roles.str.strip() == ''
+        bad_role = ~missing_role & ~roles.isin(self.valid_roles)
+        needs_deadline = (
+            actions.str.contains(self._deadline_pat, regex=True) & (deadlines == '')
+        )
+        has_trigger = full.str.contains(self._trigger_pat, regex=True)
+
+        rows = zip(rules, missing_role.tolist(), bad_role.tolist(),
+                   needs_deadline.tolist(), has_trigger.tolist(), full.tolist())
+        for rule, no_role, unnormalized, undated, triggered, full_text in rows:
+            if not (no_role or unnormalized or undated or triggered):
+                rule['ambiguity_flag'] = False
+                rule['ambiguity_reason'] = ''
+                continue
+
+            reasons = []
+            if no_role:
+                reasons.append("Responsible authority not specified")
+            elif unnormalized:
+                reasons.append(f"Role '{rule.get('responsible_role')}' not normalized")
+            if undated:
+                reasons.append("Deadline not explicitly stated")
+            if triggered:
+                # _first_trigger re-runs only on flagged rows to name
+                # the offending term in the reason string
+                trigger = self._first_trigger(full_text)
+                if trigger is not None:
+                    reasons.append(f"Uses ambiguous term '{trigger}'")
+
+            rule['ambiguity_flag'] = bool(reasons)
+            rule['ambiguity_reason'] = '; '.join(reasons)
+
+        return rules
+
+    def _enforce_ambiguity_flags_scalar(self, rules: List[Dict]) -> List[Dict]:
+        """Per-rule fallback used when pandas is unavailable."""
         for rule in rules:
             reasons = []
             
@@ -230,19 +447,19 @@ class PolicyRuleValidator:
             action = rule.get('action', '').lower()
             deadline = rule.get('deadline', '').strip()
             
-            action_requires_deadline = any(word in action for word in [
-                'within', 'pay', 'refund', 'notify', 'inform', 'submit', 'process'
-            ])
+            action_requires_deadline = self._contains_any(
+                self._deadline_automaton, self._deadline_re, action
+            )
             
             if action_requires_deadline and not deadline:
                 reasons.append("Deadline not explicitly stated")
             
-            # Check for ambiguity trigger words
+            # Check for ambiguity trigger words (first occurrence by
+            # text position; exactly one reason is appended, as before)
             full_text = action + ' ' + ' '.join(rule.get('conditions', []))
-            for trigger in self.ambiguity_triggers:
-                if trigger in full_text.lower():
-                    reasons.append(f"Uses ambiguous term '{trigger}'")
-                    break
+            trigger = self._first_trigger(full_text.lower())
+            if trigger is not None:
+                reasons.append(f"Uses ambiguous term '{trigger}'")
             
             # Set ambiguity flag
             if reasons:
@@ -260,14 +477,29 @@ class PolicyRuleValidator:
         seen = set()
         
         for rule in rules:
-            # Create signature for deduplication
-            signature = (
-                tuple(sorted(rule.get('conditions', []))),
-                rule.get('action', '').strip(),
-                rule.get('responsible_role', ''),
-                rule.get('beneficiary', '')
-            )
-            
+            # Create signature for deduplication, order-insensitive in
+            # the conditions. With orjson the four fields are serialized
+            # into one contiguous buffer and digested to 16 bytes — the
+            # seen-set then holds small bytes keys instead of references
+            # into every rule's strings. Fallback: hash the field tuple
+            # directly.
+            if orjson is not None:
+                signature = hashlib.blake2b(orjson.dumps(
+                    [
+                        sorted(rule.get('conditions', [])),
+                        rule.get('action', '').strip(),
+                        rule.get('responsible_role', ''),
+                        rule.get('beneficiary', '')
+                    ]
+                ), digest_size=16).digest()
+            else:
+                signature = (
+                    frozenset(rule.get('conditions', [])),
+                    rule.get('action', '').strip(),
+                    rule.get('responsible_role', ''),
+                    rule.get('beneficiary', '')
+                )
+
             if signature not in seen:
                 seen.add(signature)
                 unique_rules.append(rule)
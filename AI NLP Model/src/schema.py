@@ -1,6 +1,7 @@
 """Data structures and schema definitions for policy analysis"""
 
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field, validator
 
 
@@ -40,6 +41,54 @@ AMBIGUITY_TRIGGERS = [
 ]
 
 
+@dataclass(slots=True)
+class InternalRule:
+    """
+    Lean in-memory rule container for large batch processing.
+
+    Slots drop the per-instance __dict__, roughly halving memory versus
+    a plain dict per rule and making attribute access a fixed-offset
+    load. Use this when holding thousands of rules in memory; convert to
+    dicts / PolicyRule only at the API or serialization boundary.
+    """
+
+    rule_id: str = ""
+    conditions: List[str] = field(default_factory=list)
+    action: str = ""
+    responsible_role: str = ""
+    beneficiary: str = ""
+    deadline: str = ""
+    ambiguity_flag: bool = False
+    ambiguity_reason: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "InternalRule":
+        """Build from a schema-shaped rule dict (extra keys ignored)"""
+        return cls(
+            rule_id=data.get('rule_id', ''),
+            conditions=data.get('conditions') or [],
+            action=data.get('action', ''),
+            responsible_role=data.get('responsible_role', ''),
+            beneficiary=data.get('beneficiary', ''),
+            deadline=data.get('deadline', ''),
+            ambiguity_flag=bool(data.get('ambiguity_flag', False)),
+            ambiguity_reason=data.get('ambiguity_reason', ''),
+        )
+
+    def to_dict(self) -> Dict:
+        """Convert back to the schema rule-dict shape"""
+        return {
+            "rule_id": self.rule_id,
+            "conditions": self.conditions,
+            "action": self.action,
+            "responsible_role": self.responsible_role,
+            "beneficiary": self.beneficiary,
+            "deadline": self.deadline,
+            "ambiguity_flag": self.ambiguity_flag,
+            "ambiguity_reason": self.ambiguity_reason,
+        }
+
+
 class PolicyRule(BaseModel):
     """Pydantic model for a single policy rule with validation"""
     
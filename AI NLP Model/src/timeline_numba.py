@@ -0,0 +1,73 @@
+"""Optional Numba-compiled scheduling kernel for timeline estimation.
+
+TimelineEstimator maps rule ids to dense ints and encodes the
+dependency DAG's child adjacency as CSR arrays; the kernel then runs
+the whole topological sweep on contiguous int arrays instead of Python
+dicts and deques. Importing this module is safe without Numba installed
+— callers must check NUMBA_AVAILABLE first.
+"""
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    np = None
+    njit = None
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def schedule_csr(indptr, indices, durations):
+        """
+        Kahn's algorithm over a CSR child adjacency.
+
+        indptr/indices encode children[parent] (parent row i has
+        children indices[indptr[i]:indptr[i+1]]); durations is int64
+        days per rule. Returns (start, end, pred) where pred[i] is the
+        binding parent of rule i (-1 for none) — the dependency whose
+        end day set rule i's start day — for critical-path walks.
+        Nodes on a cycle are left with their duration-only estimate.
+        """
+        n = durations.shape[0]
+        start = np.zeros(n, dtype=np.int64)
+        end = np.zeros(n, dtype=np.int64)
+        pred = np.full(n, -1, dtype=np.int32)
+
+        indegree = np.zeros(n, dtype=np.int32)
+        for k in range(indices.shape[0]):
+            indegree[indices[k]] += 1
+
+        queue = np.empty(n, dtype=np.int32)
+        head = 0
+        tail = 0
+        for i in range(n):
+            if indegree[i] == 0:
+                queue[tail] = i
+                tail += 1
+
+        done = np.zeros(n, dtype=np.uint8)
+        while head < tail:
+            node = queue[head]
+            head += 1
+            done[node] = 1
+            end[node] = start[node] + durations[node]
+            for k in range(indptr[node], indptr[node + 1]):
+                child = indices[k]
+                if end[node] >= start[child]:
+                    if end[node] > start[child]:
+                        start[child] = end[node]
+                    pred[child] = node
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    queue[tail] = child
+                    tail += 1
+
+        # Cycle guard: unreached nodes keep duration-only estimates
+        for i in range(n):
+            if done[i] == 0:
+                end[i] = start[i] + durations[i]
+
+        return start, end, pred
@@ -1,60 +1,122 @@
 """Utility functions for policy analysis"""
 
 import re
+from functools import lru_cache
 from typing import List, Dict, Any
 import json
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# Whitespace runs, zero-width marks and NUL bytes (common PDF extraction
+# artifacts) collapsed to a single space in one compiled pass
+_CLEAN_RE = re.compile(r'[\s\u200b-\u200f\x00]+')
+
+# Probe for the non-whitespace artifacts str.split() can't collapse
+_ARTIFACT_RE = re.compile(r'[\u200b-\u200f\x00]')
+
 
 def clean_text(text: str) -> str:
     """
     Clean and normalize text
-    
+
     Args:
         text: Raw text to clean
-        
+
     Returns:
         Cleaned text
     """
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    # Remove leading/trailing whitespace
-    text = text.strip()
-    return text
+    # Common case: no extraction artifacts, so str.split()'s tight
+    # C scan (which also strips the ends) beats regex substitution
+    if _ARTIFACT_RE.search(text) is None:
+        return ' '.join(text.split())
+    # Artifact path: collapse whitespace and artifacts in one pass
+    return _CLEAN_RE.sub(' ', text).strip()
+
+
+@lru_cache(maxsize=2048)
+def _split_sentences_cached(text: str) -> tuple:
+    """Memoized split; cached as a tuple so entries are immutable."""
+    sentences = re.split(r'[.!?]+', text)
+    return tuple(s.strip() for s in sentences if s.strip())
 
 
 def extract_sentences(text: str) -> List[str]:
     """
     Extract sentences from text
-    
+
     Args:
         text: Text to split into sentences
-        
+
     Returns:
         List of sentences
     """
-    # Simple sentence splitting (can be enhanced)
-    sentences = re.split(r'[.!?]+', text)
-    return [s.strip() for s in sentences if s.strip()]
+    # Simple sentence splitting (can be enhanced). Repeated inputs
+    # (fallback extraction re-runs, template boilerplate) hit the cache;
+    # a fresh list is returned so callers may mutate it freely.
+    return list(_split_sentences_cached(text))
+
+
+# Fused extractor patterns, compiled once at import: each function
+# below previously re-scanned its input once per sub-pattern
+_MONEY_RE = re.compile(r'₹\s*[\d,]+|Rs\.?\s*[\d,]+|INR\s*[\d,]+')  # ₹10,000 / Rs. 10000 / INR 10000
+_TIME_RE = re.compile(
+    r'(?:within|before|after)\s+\d+\s+\w+'
+    r'|\d+\s+(?:days?|weeks?|months?|years?)',
+    re.IGNORECASE
+)
+
+# Role phrases: up to three qualifier words followed by a role keyword.
+# The bounded {0,3} is the point — the old per-keyword '[\w\s]+keyword'
+# pattern backtracked across the whole string on every one of 12 passes
+_ROLES_RE = re.compile(
+    r'\b(\w+(?:\s+\w+){0,3})\s+'
+    r'(officer|authority|committee|department|minister|secretary|director'
+    r'|head|board|council|commission|administrator)\b',
+    re.IGNORECASE
+)
+
+# Built automatons keyed by the trigger phrases themselves (not list
+# identity — CPython reuses ids of collected objects), so each distinct
+# trigger vocabulary compiles once per process
+_TRIGGER_AUTOMATA: Dict[tuple, Any] = {}
 
 
 def find_ambiguity_triggers(text: str, triggers: List[str]) -> List[str]:
     """
     Find ambiguity trigger phrases in text
-    
+
     Args:
         text: Text to search
         triggers: List of trigger phrases to look for
-        
+
     Returns:
         List of found trigger phrases
     """
     text_lower = text.lower()
+
+    # One Aho-Corasick pass finds every trigger simultaneously instead
+    # of one substring scan per trigger
+    if ahocorasick is not None:
+        key = tuple(triggers)
+        automaton = _TRIGGER_AUTOMATA.get(key)
+        if automaton is None:
+            automaton = ahocorasick.Automaton()
+            for trigger in triggers:
+                automaton.add_word(trigger.lower(), trigger)
+            automaton.make_automaton()
+            _TRIGGER_AUTOMATA[key] = automaton
+        found = {value for _, value in automaton.iter(text_lower)}
+        return [t for t in triggers if t in found]
+
     found_triggers = []
-    
     for trigger in triggers:
         if trigger.lower() in text_lower:
             found_triggers.append(trigger)
-    
+
     return found_triggers
 
 
@@ -68,19 +130,9 @@ def extract_monetary_values(text: str) -> List[str]:
     Returns:
         List of monetary values found
     """
-    # Pattern for Indian Rupee amounts
-    patterns = [
-        r'₹\s*[\d,]+',  # ₹10,000
-        r'Rs\.?\s*[\d,]+',  # Rs. 10000 or Rs 10000
-        r'INR\s*[\d,]+',  # INR 10000
-    ]
-    
-    values = []
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        values.extend(matches)
-    
-    return values
+    # Single fused alternation: one scan instead of one per currency
+    # notation; matches come back in text order
+    return _MONEY_RE.findall(text)
 
 
 def extract_time_constraints(text: str) -> List[str]:
@@ -93,23 +145,10 @@ def extract_time_constraints(text: str) -> List[str]:
     Returns:
         List of time constraints found
     """
-    # Patterns for time constraints
-    patterns = [
-        r'\d+\s+days?',
-        r'\d+\s+weeks?',
-        r'\d+\s+months?',
-        r'\d+\s+years?',
-        r'within\s+\d+\s+\w+',
-        r'before\s+\d+\s+\w+',
-        r'after\s+\d+\s+\w+',
-    ]
-    
-    constraints = []
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        constraints.extend(matches)
-    
-    return constraints
+    # Single fused alternation: one scan instead of seven. Overlapping
+    # hits ("within 30 days" / "30 days") now yield one match starting
+    # earliest in the text rather than one per pattern.
+    return _TIME_RE.findall(text)
 
 
 def extract_roles(text: str) -> List[str]:
@@ -122,23 +161,11 @@ def extract_roles(text: str) -> List[str]:
     Returns:
         List of roles found
     """
-    # Common role patterns
-    role_keywords = [
-        'officer', 'authority', 'committee', 'department',
-        'minister', 'secretary', 'director', 'head',
-        'board', 'council', 'commission', 'administrator'
-    ]
-    
-    roles = []
-    text_lower = text.lower()
-    
-    # Find phrases containing role keywords
-    for keyword in role_keywords:
-        pattern = r'\b[\w\s]+' + keyword + r'\b'
-        matches = re.findall(pattern, text_lower)
-        roles.extend([m.strip() for m in matches])
-    
-    return list(set(roles))  # Remove duplicates
+    # One pass over the text: qualifier words plus the role keyword are
+    # captured together, deduplicated case-insensitively
+    return list({
+        f"{m.group(1)} {m.group(2)}".lower() for m in _ROLES_RE.finditer(text)
+    })
 
 
 def save_json(data: Dict[Any, Any], filepath: str) -> None: